@@ -6,11 +6,8 @@ Font utility to list and test available fonts using SimPIL-Font.
 from simpilfont import Font as SimPILFont
 from PIL import ImageFont
 from typing import Dict, Any, Union
+from functools import lru_cache
 import argparse
-import json
-
-# Simple font cache to avoid reloading fonts repeatedly
-_FONT_CACHE: Dict[tuple[str, int], Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]] = {}
 
 # Global SimPIL-Font instance
 _FONT_MANAGER = SimPILFont()
@@ -24,6 +21,8 @@ def get_font_name(font_config: Dict[str, Any], default_font: Dict[str, Any]) ->
     return font_config.get("name") or default_font.get("name") or "Arial"
 
 
+# Bounded cache to avoid reloading fonts repeatedly
+@lru_cache(maxsize=64)
 def get_font(font_name: str, size: int) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
     """
     Get font using SimPIL-Font for cross-platform support.
@@ -32,26 +31,19 @@ def get_font(font_name: str, size: int) -> Union[ImageFont.FreeTypeFont, ImageFo
         font_name: Font name (e.g., "Arial Bold", "Helvetica")
         size: Font size in pixels
     """
-    key = (font_name, size)
-    font = _FONT_CACHE.get(key)
-    if font is None:
-        try:
-            # Use SimPIL-Font to find and load the font
-            font = _FONT_MANAGER(font_name, size).font
-        except Exception:
-            # Fallback: try common alternatives
-            fallback_names = ["Arial", "Arial Bold", "Helvetica", "DejaVu Sans"]
-            for fallback_name in fallback_names:
-                try:
-                    font = _FONT_MANAGER(fallback_name, size).font
-                    break
-                except Exception:
-                    continue
-            else:
-                # Ultimate fallback to PIL default
-                font = ImageFont.load_default()
-        _FONT_CACHE[key] = font
-    return font
+    try:
+        # Use SimPIL-Font to find and load the font
+        return _FONT_MANAGER(font_name, size).font
+    except Exception:
+        # Fallback: try common alternatives
+        fallback_names = ["Arial", "Arial Bold", "Helvetica", "DejaVu Sans"]
+        for fallback_name in fallback_names:
+            try:
+                return _FONT_MANAGER(fallback_name, size).font
+            except Exception:
+                continue
+        # Ultimate fallback to PIL default
+        return ImageFont.load_default()
 
 def list_fonts():
     """List all available font families on the system."""
@@ -59,44 +51,29 @@ def list_fonts():
 
     font_manager = SimPILFont()
 
-    # Export all fonts to fonts.json to get the complete list
-    font_manager.export()
+    # Collect all fonts in memory, grouped by encoding
+    fonts_data = font_manager.listing()
 
-    # Read the generated fonts.json file
-    try:
-        with open('fonts.json', 'r') as f:
-            fonts_data = json.load(f)
-
-        print("\nAvailable fonts on this system:")
-        print("-" * 50)
-
-        all_fonts = set()
-        for encoding, font_list in fonts_data.items():
-            if font_list:  # Only process non-empty lists
-                print(f"\n{encoding.upper()} encoding fonts:")
-                for font_entry in font_list:
-                    # Extract family name and style
-                    parts = font_entry.split()
-                    if len(parts) >= 2:
-                        family_name = ' '.join(parts[:-1])
-                        style = parts[-1]
-                        all_fonts.add(family_name)
-                        print(f"  {family_name} ({style})")
-                    else:
-                        all_fonts.add(font_entry)
-                        print(f"  {font_entry}")
-
-        print(f"\nTotal: {len(all_fonts)} unique font families available")
-
-        # Cleanup
-        import os
-        try:
-            os.remove('fonts.json')
-        except:
-            pass
+    print("\nAvailable fonts on this system:")
+    print("-" * 50)
 
-    except FileNotFoundError:
-        print("Error: Could not generate font list")
+    all_fonts = set()
+    for encoding, font_list in fonts_data.items():
+        if font_list:  # Only process non-empty lists
+            print(f"\n{encoding.upper()} encoding fonts:")
+            for font_entry in font_list:
+                # Extract family name and style
+                parts = font_entry.split()
+                if len(parts) >= 2:
+                    family_name = ' '.join(parts[:-1])
+                    style = parts[-1]
+                    all_fonts.add(family_name)
+                    print(f"  {family_name} ({style})")
+                else:
+                    all_fonts.add(font_entry)
+                    print(f"  {font_entry}")
+
+    print(f"\nTotal: {len(all_fonts)} unique font families available")
 
 def find_font(font_name):
     """Find and test a specific font."""
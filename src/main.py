@@ -1,9 +1,11 @@
 import argparse
-from parser import parse_dive_log, DiveLogError, extract_dive_segment
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from parser import parse_dive_log, parse_dive_log_cached, DiveLogError, extract_dive_segment
 from template import load_template, TemplateError
-from overlay import generate_overlay_video, generate_test_template_image
-from profile_graph import generate_profile_overlay_video, generate_test_profile_image
-from video_metadata import extract_video_metadata, detect_timezone_offset
+# overlay, profile_graph and video_metadata pull in OpenCV/PIL, so they are imported
+# only by the branches that use them (keeps --help and argument errors fast)
 from video_segment_errors import (
     VideoSegmentError, VideoReadError, VideoMetadataError,
     TimezoneOffsetError, SegmentOutOfBoundsError, EmptySegmentError
@@ -23,8 +25,13 @@ def main():
     parser.add_argument("--match-video", help="Video file to match for automatic segment extraction")
     parser.add_argument("--start", type=int, help="Manual segment start time in seconds from dive start")
     parser.add_argument("--shearwater-date-format", help="Override date format for Shearwater XML files (e.g., '%%m/%%d/%%Y %%I:%%M:%%S %%p' for US format)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes used to render computer overlay frames (default: 1)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write on-disk caches: always re-parse the dive log and re-probe font files")
     args = parser.parse_args()
 
+    # Parser status messages go through logging; show them like the rest of the CLI output
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Validate template arguments
     if not args.template and not args.profile_template:
         parser.error("Either --template or --profile-template is required")
@@ -38,6 +45,9 @@ def main():
     if args.start is not None and args.duration is None:
         parser.error("--duration is required when using --start")
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     units_override = None
     if args.units:
         if args.units == "metric":
@@ -45,17 +55,23 @@ def main():
         else:  # imperial
             units_override = {"depth": "ft", "pressure": "psi", "temperature": "F"}
 
+    if args.no_cache:
+        from simpilfont import set_disk_cache
+        set_disk_cache(False)
+
     # Test template shortcut
     if args.test_template:
         try:
             if args.profile_template:
                 # Test profile template
+                from profile_graph import generate_test_profile_image
                 template = load_template(args.profile_template)
                 print("Generating test profile template image...")
                 generate_test_profile_image(template, "test_profile_template.png", units_override=units_override)
                 print("✅ Test profile template image saved as test_profile_template.png")
             else:
                 # Test computer overlay template
+                from overlay import generate_test_template_image
                 template = load_template(args.template)
                 print("Generating test template image...")
                 generate_test_template_image(template, "test_template.png", units_override=units_override)
@@ -67,9 +83,19 @@ def main():
             print("   Please check that all dependencies are installed.")
         return
 
+    # Reading the video metadata does not depend on the dive log and mostly waits on
+    # OpenCV/MediaInfo outside the GIL, so start it while the log is parsed
+    video_metadata_future = None
+    if args.match_video:
+        from video_metadata import extract_video_metadata, detect_timezone_offset
+        executor = ThreadPoolExecutor(max_workers=1)
+        video_metadata_future = executor.submit(extract_video_metadata, args.match_video)
+        executor.shutdown(wait=False)
+
     # Parse dive log
     try:
-        dive_data = parse_dive_log(args.log, shearwater_date_format=args.shearwater_date_format)
+        parse = parse_dive_log if args.no_cache else parse_dive_log_cached
+        dive_data = parse(args.log, shearwater_date_format=args.shearwater_date_format)
         if not dive_data.samples:
             print("❌ No dive data parsed. Exiting.")
             return
@@ -91,7 +117,7 @@ def main():
         # Automatic segment matching mode
         try:
             print(f"🔍 Analyzing video: {args.match_video}")
-            video_metadata = extract_video_metadata(args.match_video)
+            video_metadata = video_metadata_future.result()
             print(f"   Video duration: {video_metadata.duration:.1f}s")
             source_label = "video metadata" if video_metadata.source == "video_metadata" else "file system"
             print(f"   Creation time: {video_metadata.start_time} (from {source_label})")
@@ -212,11 +238,13 @@ def main():
 
     try:
         if template_type == "profile":
+            from profile_graph import generate_profile_overlay_video
             # For profile graphs, always render full dive profile even when generating segment video
             full_samples = dive_data.samples
             generate_profile_overlay_video(full_samples, template, args.output, resolution=resolution, duration=duration, fps=args.fps, units_override=units_override, time_offset=time_offset, segment_samples=dive_samples if time_offset > 0 else None)
         else:
-            generate_overlay_video(dive_samples, template, args.output, resolution=resolution, duration=duration, fps=args.fps, units_override=units_override, time_offset=time_offset)
+            from overlay import generate_overlay_video
+            generate_overlay_video(dive_samples, template, args.output, resolution=resolution, duration=duration, fps=args.fps, units_override=units_override, time_offset=time_offset, workers=args.workers)
         print(f"✅ Done. Overlay video saved to: {args.output}")
     except Exception as e:
         print(f"❌ Error generating overlay video: {e}")
@@ -224,6 +252,8 @@ def main():
         return
 
 if __name__ == "__main__":
+    # Needed for --workers in the frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     try:
         main()
     except KeyboardInterrupt:
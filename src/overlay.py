@@ -1,9 +1,20 @@
+import functools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import math
+import operator
+import re
+import dataclasses
+from dataclasses import dataclass
 import cv2
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from typing import Dict, Any, List, Optional, Callable, Union
-from parser import DiveSample
+from parser import DiveSample, samples_to_arrays
 from font_utils import get_font_name, get_font
+from simpilfont import set_disk_cache as set_font_disk_cache, disk_cache_enabled as font_disk_cache_enabled
+from video_writer import OverlayVideoWriter
 
 # Canonical source units from parser (Subsurface): meters, bar, Celsius
 _SOURCE_UNITS = {
@@ -24,25 +35,62 @@ _DEF_CONVERTERS = {
 
 def _build_converter(quantity: str, src_unit: str, target_unit: str) -> Optional[Callable[[Any], Any]]:
     # Internal data always metric (m, bar, C). Only build converter if target is imperial.
+    # Converters are plain arithmetic (usable on NumPy arrays too); callers only pass numbers.
     if not target_unit:
         return None
     target = target_unit.lower()
     if quantity == "temperature":
         if src_unit.lower() == "c" and target in ("f", "°f", "fahrenheit"):
-            return lambda v: ((v * 9/5) + 32) if isinstance(v, (int, float)) else v
+            return lambda v: (v * 9/5) + 32
         return None
-    key = (quantity, src_unit, target)
-    fn = _DEF_CONVERTERS.get(key)
-    return (lambda v: fn(v) if isinstance(v, (int, float)) else v) if fn else None
+    return _DEF_CONVERTERS.get((quantity, src_unit, target))
 
 # Pre-compiled template for faster rendering
+
+@dataclass(slots=True)
+class _DataItem:
+    field: Optional[str]
+    compute: Optional[str]
+    unit: str
+    x: int
+    y: int
+    font: Any
+    color: tuple[int, int, int]
+    fallback: Any
+    precision: Optional[int]
+    # Value source for this item: compiled compute expression or field getter
+    getter: Optional[Callable[[DiveSample], Any]] = None
+    convert: Optional[Callable[[Any], Any]] = None
+    final_unit: str = ""
+    # Converted values per sample index, filled by _precompute_converted_values
+    values: Optional[List[Any]] = None
+
 class _CompiledTemplate:
-    def __init__(self, base_img: Image.Image, data_items: List[Dict[str, Any]], frame_size: tuple[int, int], units_map: Dict[str, str]):
+    def __init__(self, base_img: Image.Image, data_items: List[_DataItem], frame_size: tuple[int, int], units_map: Dict[str, str]):
         self.base_img = base_img
         self.data_items = data_items
         self.frame_size = frame_size
         self.units_map = units_map  # e.g. {"depth": "ft", "pressure": "psi", "temperature": "F"}
-        self.has_converters = any(it.get("_convert") for it in data_items)
+        self.has_converters = any(it.convert for it in data_items)
+        # Persistent working frame: only the regions covered by the previous
+        # frame's dynamic text are restored from base_img before redrawing
+        self.work_img = base_img.copy()
+        self.work_draw = ImageDraw.Draw(self.work_img)
+        self.dirty_boxes: List[tuple[int, int, int, int]] = []
+        # Bounded FIFO of rasterized text masks keyed by (item index, display string)
+        self._text_mask_cache: Dict[tuple[int, str], tuple[tuple[int, int], Optional[Image.Image]]] = {}
+        self._text_mask_cache_size = max(1, len(data_items) * 256)
+
+
+def _resize_rgba(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+    # OpenCV resize on premultiplied alpha (as PIL does for RGBA) so transparent
+    # pixels don't bleed their color into the edges; area averaging when shrinking.
+    if size[0] <= img.width and size[1] <= img.height:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LANCZOS4
+    resized = cv2.resize(np.asarray(img.convert("RGBa")), size, interpolation=interpolation)
+    return Image.frombytes("RGBa", size, resized.tobytes()).convert("RGBA")
 
 
 def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], units_override: Optional[Dict[str, str]] = None) -> _CompiledTemplate:
@@ -60,12 +108,12 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
                 fg_ratio = fg.width / fg.height
                 frame_ratio = frame_size[0] / frame_size[1]
                 if abs(fg_ratio - frame_ratio) < 0.01:
-                    fg_resized = fg.resize(frame_size, Image.Resampling.LANCZOS)
+                    fg_resized = _resize_rgba(fg, frame_size)
                 elif fg_ratio > frame_ratio:
                     # Wider than frame: fit width
                     new_w = frame_size[0]
                     new_h = int(new_w / fg_ratio)
-                    fg_resized = fg.resize((new_w, new_h), Image.Resampling.LANCZOS)
+                    fg_resized = _resize_rgba(fg, (new_w, new_h))
                     pad_y = (frame_size[1] - new_h) // 2
                     tmp = Image.new("RGBA", frame_size, chroma_rgb + (255,))
                     tmp.paste(fg_resized, (0, pad_y), fg_resized)
@@ -74,7 +122,7 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
                     # Taller than frame: fit height
                     new_h = frame_size[1]
                     new_w = int(new_h * fg_ratio)
-                    fg_resized = fg.resize((new_w, new_h), Image.Resampling.LANCZOS)
+                    fg_resized = _resize_rgba(fg, (new_w, new_h))
                     pad_x = (frame_size[0] - new_w) // 2
                     tmp = Image.new("RGBA", frame_size, chroma_rgb + (255,))
                     tmp.paste(fg_resized, (pad_x, 0), fg_resized)
@@ -90,12 +138,19 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
         bg_color = hex_to_rgb(template.get("background_color", "#000000"))
         base = Image.new("RGBA", frame_size, bg_color + (255,))
 
+    # The background is fully composited at this point, so drop the alpha channel:
+    # frames are rendered in RGB and handed to the video writer as a BGR view.
+    base = base.convert("RGB")
     draw = ImageDraw.Draw(base)
 
     default_label_font = template.get("default_label_font", {})
     default_data_font = template.get("default_data_font", {})
+    default_label_size = default_label_font.get("size", 22)
+    default_label_color = default_label_font.get("color", "#FFFFFF")
+    default_data_size = default_data_font.get("size", 22)
+    default_data_color = default_data_font.get("color", "#FFFFFF")
 
-    data_items: List[Dict[str, Any]] = []
+    data_items: List[_DataItem] = []
 
     for item in template.get("items", []):
         item_type = item.get("type", "data")  # Default to "data" for backward compatibility
@@ -107,9 +162,10 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
             x, y = pos.get("x", 0), pos.get("y", 0)
 
             # Use label font as default for text items
-            font_size = item.get("font", {}).get("size", default_label_font.get("size", 22))
-            font_name = get_font_name(item.get("font", {}), default_label_font)
-            font_color = hex_to_rgb(item.get("font", {}).get("color", default_label_font.get("color", "#FFFFFF")))
+            font_cfg = item.get("font", {})
+            font_size = font_cfg.get("size", default_label_size)
+            font_name = get_font_name(font_cfg, default_label_font)
+            font_color = hex_to_rgb(font_cfg.get("color", default_label_color))
 
             font = get_font(font_name, font_size)
             draw.text((x, y), text, font=font, fill=font_color)
@@ -127,39 +183,33 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
             fallback_value = item.get("fallback", "N/A")
 
             # Draw label (static) onto base
-            label_pos = item.get("label_position", {"x": 0, "y": 0})
-            label_x, label_y = label_pos.get("x", 0), label_pos.get("y", 0)
-            label_font_size = item.get("label_font", {}).get("size", default_label_font.get("size", 22))
-            label_font_name = get_font_name(item.get("label_font", {}), default_label_font)
-            label_font = get_font(label_font_name, label_font_size)
-            label_color = hex_to_rgb(item.get("label_font", {}).get("color", default_label_font.get("color", "#FFFFFF")))
-
             if label:
-                draw.text((label_x, label_y), label, font=label_font, fill=label_color)
+                label_pos = item.get("label_position", {"x": 0, "y": 0})
+                label_cfg = item.get("label_font", {})
+                label_font = get_font(get_font_name(label_cfg, default_label_font), label_cfg.get("size", default_label_size))
+                label_color = hex_to_rgb(label_cfg.get("color", default_label_color))
+                draw.text((label_pos.get("x", 0), label_pos.get("y", 0)), label, font=label_font, fill=label_color)
 
             # Prepare data (dynamic) rendering info
             data_pos = item.get("data_position")
             if not data_pos:
                 continue  # Skip if no data position specified
 
-            data_x, data_y = data_pos.get("x", 0), data_pos.get("y", 0)
-            data_font_size = item.get("data_font", {}).get("size", default_data_font.get("size", 22))
-            data_font_name = get_font_name(item.get("data_font", {}), default_data_font)
-            data_font = get_font(data_font_name, data_font_size)
-            data_color = hex_to_rgb(item.get("data_color", item.get("data_font", {}).get("color", default_data_font.get("color", "#FFFFFF"))))
-            precision = item.get("precision")
-
-            data_items.append({
-                "field": field,
-                "compute": compute_expr,
-                "unit": unit,
-                "x": data_x,
-                "y": data_y,
-                "font": data_font,
-                "color": data_color,
-                "fallback": fallback_value,
-                "precision": precision,
-            })
+            data_cfg = item.get("data_font", {})
+            data_font = get_font(get_font_name(data_cfg, default_data_font), data_cfg.get("size", default_data_size))
+            data_color = hex_to_rgb(item.get("data_color", data_cfg.get("color", default_data_color)))
+
+            data_items.append(_DataItem(
+                field=field,
+                compute=compute_expr,
+                unit=unit,
+                x=data_pos.get("x", 0),
+                y=data_pos.get("y", 0),
+                font=data_font,
+                color=data_color,
+                fallback=fallback_value,
+                precision=item.get("precision"),
+            ))
 
     units_map = template.get("units", {}).copy()
     if units_override:
@@ -167,12 +217,12 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
 
     # Precompute converters & final unit labels
     for it in data_items:
-        field_name = it["field"]
+        field_name = it.field
+        it.getter = compile_compute_expression(it.compute) if it.compute else compile_field_getter(field_name)
+        it.final_unit = it.unit
 
         # Skip unit conversion for computed fields
         if field_name is None:
-            it["_convert"] = None
-            it["_final_unit"] = it.get("unit", "")
             continue
 
         if field_name.startswith("pressure["):
@@ -185,88 +235,166 @@ def _compile_template(template: Dict[str, Any], frame_size: tuple[int, int], uni
             quantity = "temperature"
         else:
             quantity = None
-        it["_convert"] = None
-        it["_final_unit"] = it.get("unit", "")
         if quantity:
             src = _SOURCE_UNITS.get(quantity)
             target = units_map.get(quantity)
             if src and target:
                 conv = _build_converter(quantity, src, target)
                 if conv:
-                    it["_convert"] = conv
-                    if it["_final_unit"].strip():  # only replace label if original had one
-                        it["_final_unit"] = target
+                    it.convert = conv
+                    if it.final_unit.strip():  # only replace label if original had one
+                        it.final_unit = target
 
     return _CompiledTemplate(base, data_items, frame_size, units_map)
 
 
-def _render_dynamic_frame(data: DiveSample, compiled: _CompiledTemplate) -> np.ndarray:
-    img = compiled.base_img.copy()
-    draw = ImageDraw.Draw(img)
-    draw_text = draw.text  # local binding
+def _precompute_converted_values(dive_samples: List[DiveSample], compiled: _CompiledTemplate) -> None:
+    """Convert every sample's value once per unit-converted item using NumPy."""
     for it in compiled.data_items:
-        # Check if this is a computed field or regular field
-        if it.get("compute"):
-            value = evaluate_compute_expression(it["compute"], data)
-        else:
-            value = extract_value_from_data(it["field"], data)
-
+        if it.convert is None or it.compute:
+            continue
+        getter = it.getter
+        values = []
+        for s in dive_samples:
+            value = getter(s)
+            values.append(it.fallback if value is None else value)
+        numeric = [i for i, v in enumerate(values) if isinstance(v, (int, float))]
+        if numeric:
+            arr = np.fromiter((values[i] for i in numeric), dtype=np.float64, count=len(numeric))
+            for i, v in zip(numeric, it.convert(arr).tolist()):
+                values[i] = v
+        it.values = values
+
+
+def _format_display(it: _DataItem, data: DiveSample, sample_index: Optional[int] = None) -> str:
+    if it.values is not None and sample_index is not None:
+        # Already extracted and unit-converted for this sample
+        value = it.values[sample_index]
+    else:
+        value = it.getter(data)
         if value is None:
-            value = it["fallback"]
-        conv = it.get("_convert")
-        if conv:
-            try:
-                value = conv(value)
-            except Exception:
-                pass
-        precision = it.get("precision")
-        if precision is not None:
-            try:
-                if isinstance(value, (int, float)) and not (isinstance(value, int) and precision == 0):
-                    value = f"{float(value):.{precision}f}"
-                elif not isinstance(value, (int, float)):
-                    value = f"{float(value):.{precision}f}"
-            except Exception:
-                pass
-        unit = it.get("_final_unit", "")
-        display = f"{value} {unit}".strip()
-        draw_text((it["x"], it["y"]), display, font=it["font"], fill=it["color"])
-    return np.array(img)
+            value = it.fallback
+        if it.convert is not None and isinstance(value, (int, float)):
+            value = it.convert(value)
+    precision = it.precision
+    if precision is not None:
+        try:
+            if isinstance(value, (int, float)) and not (isinstance(value, int) and precision == 0):
+                value = f"{float(value):.{precision}f}"
+            elif not isinstance(value, (int, float)):
+                value = f"{float(value):.{precision}f}"
+        except Exception:
+            pass
+    return f"{value} {it.final_unit}".strip()
+
+
+def _render_text_mask(draw: ImageDraw.ImageDraw, it: _DataItem, display: str) -> tuple[tuple[int, int], Optional[Image.Image]]:
+    """Rasterize a display string once into a coverage mask cropped to its ink.
+
+    Returns the frame position of the mask's top-left corner and the "L" mask, or
+    None for strings that draw nothing. Pasting the item color through the mask gives
+    exactly the pixels ImageDraw.text would have drawn at (it.x, it.y).
+    """
+    left, top, right, bottom = draw.textbbox((it.x, it.y), display, font=it.font)
+    left, top = math.floor(left), math.floor(top)
+    # Margin for glyphs whose ink reaches outside the layout box
+    pad = max(4, (math.ceil(bottom) - top) // 2)
+    mask = Image.new("L", (math.ceil(right) - left + 2 * pad, math.ceil(bottom) - top + 2 * pad), 0)
+    ImageDraw.Draw(mask).text((it.x - left + pad, it.y - top + pad), display, font=it.font, fill=255)
+    ink_box = mask.getbbox()
+    if ink_box is None:
+        return (0, 0), None
+    return (left - pad + ink_box[0], top - pad + ink_box[1]), mask.crop(ink_box)
+
+
+def _render_dynamic_frame(data: DiveSample, compiled: _CompiledTemplate, sample_index: Optional[int] = None) -> np.ndarray:
+    """Render the dynamic values for one sample and return the frame as a BGR array view."""
+    img = compiled.work_img
+    base_img = compiled.base_img
+    width, height = compiled.frame_size
+
+    # Restore the static background under the previous frame's text
+    for box in compiled.dirty_boxes:
+        img.paste(base_img.crop(box), box)
+    dirty_boxes = []
+
+    text_masks = compiled._text_mask_cache
+    for i, it in enumerate(compiled.data_items):
+        display = _format_display(it, data, sample_index)
+
+        mask_key = (i, display)
+        text_mask = text_masks.get(mask_key)
+        if text_mask is None:
+            text_mask = _render_text_mask(compiled.work_draw, it, display)
+            if len(text_masks) >= compiled._text_mask_cache_size:
+                del text_masks[next(iter(text_masks))]  # evict oldest entry
+            text_masks[mask_key] = text_mask
+        origin, mask = text_mask
+        if mask is None:
+            continue
+        left, top = origin
+        right, bottom = left + mask.width, top + mask.height
+        img.paste(it.color, (left, top, right, bottom), mask)
+        box = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+        if box[0] < box[2] and box[1] < box[3]:
+            dirty_boxes.append(box)
+    compiled.dirty_boxes = dirty_boxes
+    # Reverse the channel axis of the RGB buffer instead of running cvtColor. The copy
+    # makes the frame contiguous once here rather than in every encoder write.
+    return np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+
+
+_SAMPLE_FIELDS = frozenset(f.name for f in dataclasses.fields(DiveSample))
 
 
 def extract_value_from_data(field: str, data: DiveSample):
+    return compile_field_getter(field)(data)
+
+
+def _format_time(data: DiveSample) -> str:
     # time formatting (required field, should never be None)
-    if field == "time":
-        t = data.time
-        minutes = int(t) // 60
-        seconds = int(t) % 60
-        return f"{minutes}:{seconds:02d}"
+    t = int(data.time)
+    return f"{t // 60}:{t % 60:02d}"
 
-    # pressure[i] - handle optional pressure list
-    if field.startswith("pressure["):
+
+def _indexed_getter(attr: str, index_text: str) -> Callable[[DiveSample], Any]:
+    try:
+        index = int(index_text)
+    except ValueError:
+        return lambda data: None
+
+    def get(data: DiveSample):
         try:
-            index = int(field[9:-1])
-            pressures = data.pressure
-            if pressures is None or index >= len(pressures):
+            values = getattr(data, attr)
+            if values is None or index >= len(values):
                 return None
-            return pressures[index]
+            return values[index]
         except Exception:
             return None
+    return get
+
 
-    # ppo2_sensors[i] - handle optional PPO2 sensor list
+@functools.lru_cache(maxsize=None)
+def compile_field_getter(field: str) -> Callable[[DiveSample], Any]:
+    """
+    Resolve a template field name once into a function returning its value for a sample.
+
+    Supports "time" (formatted as M:SS), "pressure[i]" and "ppo2_sensors[i]" (None when
+    the index is missing) and plain DiveSample attributes (None when unknown).
+    """
+    if field == "time":
+        return _format_time
+
+    # pressure[i] / ppo2_sensors[i] - handle optional lists
+    if field.startswith("pressure["):
+        return _indexed_getter("pressure", field[9:-1])
     if field.startswith("ppo2_sensors["):
-        try:
-            index = int(field[13:-1])
-            sensors = data.ppo2_sensors
-            if sensors is None or index >= len(sensors):
-                return None
-            return sensors[index]
-        except Exception:
-            return None
+        return _indexed_getter("ppo2_sensors", field[13:-1])
 
+    if field in _SAMPLE_FIELDS:
+        return operator.attrgetter(field)
     # Handle all other fields - use getattr with None default for optional fields
-    value = getattr(data, field, None)
-    return value
+    return lambda data: getattr(data, field, None)
 
 
 def evaluate_compute_expression(compute_expr: str, data: DiveSample) -> Optional[str]:
@@ -281,89 +409,178 @@ def evaluate_compute_expression(compute_expr: str, data: DiveSample) -> Optional
 
     Example: "{fractionO2:02%}/{fractionHe:02%}" -> "32/05"
     """
-    import re
-
-    # Find all field references like {field} or {field:format}
-    pattern = r'\{([^}:]+)(?::([^}]+))?\}'
-    matches = re.findall(pattern, compute_expr)
-
-    result = compute_expr
-    for field_name, format_spec in matches:
-        # Get the field value
-        field_value = getattr(data, field_name, None)
-
-        if field_value is None:
-            return None  # If any required field is missing, return None
-
-        # Apply formatting
-        if format_spec:
-            if format_spec.endswith('%'):
-                # Percentage formatting (fraction to percentage)
-                digits = format_spec[:-1]
-                try:
-                    precision = int(digits) if digits else 2
-                    formatted_value = f"{round(field_value * 100):0{precision}d}"
-                except (ValueError, TypeError):
-                    formatted_value = str(field_value)
-            elif 'f' in format_spec:
-                # Float formatting
-                try:
-                    formatted_value = f"{field_value:{format_spec}}"
-                except (ValueError, TypeError):
-                    formatted_value = str(field_value)
-            else:
-                # Default formatting
-                formatted_value = f"{field_value:{format_spec}}"
-        else:
-            # No formatting specified
-            formatted_value = str(field_value)
+    return compile_compute_expression(compute_expr)(data)
 
-        # Replace in the result string
-        old_pattern = '{' + field_name + (':' + format_spec if format_spec else '') + '}'
-        result = result.replace(old_pattern, formatted_value)
 
-    return result
+# Field references like {field} or {field:format}
+_COMPUTE_FIELD_PATTERN = re.compile(r'\{([^}:]+)(?::([^}]+))?\}')
 
 
-def generate_overlay_video(dive_samples: List[DiveSample], template: Dict[str, Any], output_path: str, resolution=(480, 280), duration=None, fps=30, units_override: Optional[Dict[str, str]] = None, time_offset: int = 0):
-    fourcc_func = getattr(cv2, "VideoWriter_fourcc", None)
-    fourcc = fourcc_func(*'mp4v') if fourcc_func else 0
-    out = cv2.VideoWriter(output_path, fourcc, fps, resolution)
+def _compute_formatter(format_spec: str) -> Callable[[Any], str]:
+    if not format_spec:
+        # No formatting specified
+        return str
+    if format_spec.endswith('%'):
+        # Percentage formatting (fraction to percentage)
+        digits = format_spec[:-1]
+        try:
+            precision = int(digits) if digits else 2
+        except ValueError:
+            return str
 
-    compiled = _compile_template(template, resolution, units_override)
+        def fmt_percent(value):
+            try:
+                return f"{round(value * 100):0{precision}d}"
+            except (ValueError, TypeError):
+                return str(value)
+        return fmt_percent
+    if 'f' in format_spec:
+        # Float formatting
+        def fmt_float(value):
+            try:
+                return format(value, format_spec)
+            except (ValueError, TypeError):
+                return str(value)
+        return fmt_float
+    # Default formatting
+    return lambda value: format(value, format_spec)
 
+
+@functools.lru_cache(maxsize=None)
+def compile_compute_expression(compute_expr: str) -> Callable[[DiveSample], Optional[str]]:
+    """
+    Compile a compute expression into a function of a sample.
+
+    The expression is scanned once; the returned function only looks up the referenced
+    fields and joins the formatted values with the static text between them. It returns
+    None if any referenced field is missing, like evaluate_compute_expression.
+    """
+    chunks: List[str] = []
+    slots: List[tuple[str, Callable[[Any], str]]] = []
+    pos = 0
+    for match in _COMPUTE_FIELD_PATTERN.finditer(compute_expr):
+        chunks.append(compute_expr[pos:match.start()])
+        field_name, format_spec = match.group(1), match.group(2) or ""
+        slots.append((field_name, _compute_formatter(format_spec)))
+        pos = match.end()
+    tail = compute_expr[pos:]
+
+    if not slots:
+        return lambda data: compute_expr
+
+    def compute(data: DiveSample) -> Optional[str]:
+        parts = []
+        for chunk, (field_name, fmt) in zip(chunks, slots):
+            value = getattr(data, field_name, None)
+            if value is None:
+                return None  # If any required field is missing, return None
+            parts.append(chunk)
+            parts.append(fmt(value))
+        parts.append(tail)
+        return "".join(parts)
+
+    return compute
+
+
+def _sample_indices_per_second(dive_samples: List[DiveSample], total_seconds: int, time_offset: int = 0) -> List[int]:
+    """Map every rendered second to the index of the latest sample at or before it.
+
+    Seconds before the first sample map to index 0. Sample times are expected to be
+    sorted, as produced by the parsers.
+    """
+    if not dive_samples or total_seconds <= 0:
+        return []
+    times = samples_to_arrays(dive_samples, ("time",))["time"]
+    dive_times = np.arange(total_seconds, dtype=np.float64) + time_offset
+    indices = np.searchsorted(times, dive_times, side="right") - 1
+    np.maximum(indices, 0, out=indices)
+    return indices.tolist()
+
+
+def _render_frames(dive_samples: List[DiveSample], compiled: _CompiledTemplate, sample_indices: List[int]):
+    # Samples usually change less often than once per second, so keep the last
+    # rendered frame and only re-render when the active sample advances
+    last_idx = -1
+    frame_bgr = None
+    for idx in sample_indices:
+        if idx != last_idx:
+            frame_bgr = _render_dynamic_frame(dive_samples[idx], compiled, idx)
+            last_idx = idx
+        yield frame_bgr
+
+
+# Per-process state for parallel rendering: (dive_samples, compiled template)
+_WORKER_STATE: Optional[tuple[List[DiveSample], _CompiledTemplate]] = None
+
+
+def _init_render_worker(dive_samples: List[DiveSample], template: Dict[str, Any], resolution: tuple[int, int], units_override: Optional[Dict[str, str]], font_disk_cache: bool):
+    global _WORKER_STATE
+    # Spawned workers don't inherit the parent's module state
+    set_font_disk_cache(font_disk_cache)
+    compiled = _compile_template(template, resolution, units_override)
+    if compiled.has_converters:
+        _precompute_converted_values(dive_samples, compiled)
+    _WORKER_STATE = (dive_samples, compiled)
+
+
+def _render_frame_in_worker(idx: int) -> bytes:
+    dive_samples, compiled = _WORKER_STATE
+    return np.ascontiguousarray(_render_dynamic_frame(dive_samples[idx], compiled, idx)).tobytes()
+
+
+def _render_frames_parallel(dive_samples: List[DiveSample], template: Dict[str, Any], resolution: tuple[int, int], units_override: Optional[Dict[str, str]], sample_indices: List[int], workers: int):
+    # Each distinct sample is rendered once by a worker process; results come back in order.
+    # Only a few frames per worker are in flight so finished frames can't pile up
+    # faster than the writer consumes them.
+    unique_indices = iter([idx for i, idx in enumerate(sample_indices) if i == 0 or idx != sample_indices[i - 1]])
+    width, height = resolution
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                               initargs=(dive_samples, template, resolution, units_override, font_disk_cache_enabled()))
+    try:
+        pending = deque(pool.submit(_render_frame_in_worker, idx) for idx in itertools.islice(unique_indices, workers * 4))
+        last_idx = -1
+        frame_bgr = None
+        for idx in sample_indices:
+            if idx != last_idx:
+                frame_bgr = np.frombuffer(pending.popleft().result(), dtype=np.uint8).reshape(height, width, 3)
+                last_idx = idx
+                for next_idx in itertools.islice(unique_indices, 1):
+                    pending.append(pool.submit(_render_frame_in_worker, next_idx))
+            yield frame_bgr
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def generate_overlay_video(dive_samples: List[DiveSample], template: Dict[str, Any], output_path: str, resolution=(480, 280), duration=None, fps=30, units_override: Optional[Dict[str, str]] = None, time_offset: int = 0, workers: int = 1):
+    """Render the overlay video; workers > 1 renders frames in that many processes."""
     # Determine total seconds to render, then duplicate frames per second
     if duration is not None:
         total_seconds = int(duration)
     else:
         total_seconds = int(dive_samples[-1].time) + 1 if dive_samples else 0
 
-    # Pointer to current sample for O(1) lookup per second
-    idx = 0
+    if not dive_samples:
+        total_seconds = 0
+    sample_indices = _sample_indices_per_second(dive_samples, total_seconds, time_offset)
+
+    if workers > 1 and total_seconds > 0:
+        frames = _render_frames_parallel(dive_samples, template, resolution, units_override, sample_indices, workers)
+    else:
+        compiled = _compile_template(template, resolution, units_override)
+        if compiled.has_converters:
+            _precompute_converted_values(dive_samples, compiled)
+        frames = _render_frames(dive_samples, compiled, sample_indices)
 
     print(f"Generating {total_seconds * fps} frames in {total_seconds} seconds (rendering once/second)...")
     progress_step = max(1, total_seconds // 10)
 
-    for sec in range(total_seconds):
-        # Advance sample pointer to latest sample <= current dive time
-        dive_time = sec + time_offset
-        while idx + 1 < len(dive_samples) and dive_samples[idx + 1].time <= dive_time:
-            idx += 1
-        sample = dive_samples[idx] if dive_samples else None
-        if sample is None:
-            break
-
-        frame_rgba = _render_dynamic_frame(sample, compiled)
-        frame_bgr = cv2.cvtColor(frame_rgba, cv2.COLOR_RGBA2BGR)
-
-        for _ in range(fps):
-            out.write(frame_bgr)
-
-        if (sec + 1) % progress_step == 0 or sec == total_seconds - 1:
-            percent = (sec + 1) / total_seconds * 100 if total_seconds else 100
-            print(f"Progress: {percent:.1f}% ({sec + 1}/{total_seconds} sec)")
+    with OverlayVideoWriter(output_path, fps, resolution, total_seconds) as out:
+        for sec, frame_bgr in enumerate(frames):
+            out.write_second(frame_bgr)
 
-    out.release()
+            if (sec + 1) % progress_step == 0 or sec == total_seconds - 1:
+                percent = (sec + 1) / total_seconds * 100 if total_seconds else 100
+                print(f"Progress: {percent:.1f}% ({sec + 1}/{total_seconds} sec)")
 
 
 def generate_test_template_image(template: Dict[str, Any], output_path: str, units_override: Optional[Dict[str, str]] = None):
@@ -384,10 +601,11 @@ def generate_test_template_image(template: Dict[str, Any], output_path: str, uni
     )
 
     compiled = _compile_template(template, frame_size, units_override)
-    img_array = _render_dynamic_frame(dummy_data, compiled)
-    img = Image.fromarray(img_array)
+    frame_bgr = _render_dynamic_frame(dummy_data, compiled)
+    img = Image.fromarray(frame_bgr[:, :, ::-1])
     img.save(output_path)
 
+@functools.lru_cache(maxsize=128)
 def hex_to_rgb(hex_color):
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    r, g, b = bytes.fromhex(hex_color.lstrip('#')[:6])
+    return r, g, b
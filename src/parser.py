@@ -1,15 +1,24 @@
 import re
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
+from bisect import bisect_left, bisect_right
+from operator import attrgetter, itemgetter
+from typing import Callable, Iterable, List, Dict, Any, Optional
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone, timedelta
-import copy
+import hashlib
 import locale
+import logging
+import os
+import pickle
+import numpy as np
 from video_segment_errors import SegmentOutOfBoundsError, EmptySegmentError
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class DiveSample:
     """Represents a single dive sample with all dive computer data."""
     time: int  # Time in seconds from dive start
@@ -36,6 +45,40 @@ class DiveData:
     start_time: datetime  # Dive start time in UTC
     end_time: datetime  # Dive end time in UTC
 
+# DiveSample fields holding one value per cylinder / sensor
+_LIST_FIELDS = ("pressure", "ppo2_sensors")
+
+
+def samples_to_arrays(samples: List[DiveSample], names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """Convert samples into one NumPy column per DiveSample field (struct of arrays).
+
+    Lets consumers work on whole columns with vectorised NumPy operations instead of
+    reading a field from every sample object in a Python loop.
+
+    Args:
+        samples: Dive samples
+        names: Fields to convert (default: all)
+
+    Returns:
+        Dict of field name to float64 array of length len(samples), with NaN for missing
+        values. pressure and ppo2_sensors become (len(samples), n) arrays padded with NaN.
+    """
+    count = len(samples)
+    arrays: Dict[str, np.ndarray] = {}
+    for name in (names if names is not None else [f.name for f in fields(DiveSample)]):
+        get = attrgetter(name)
+        if name in _LIST_FIELDS:
+            rows = [get(s) for s in samples]
+            column = np.full((count, max(map(len, rows), default=0)), np.nan)
+            for i, row in enumerate(rows):
+                if row:
+                    column[i, :len(row)] = [np.nan if v is None else v for v in row]
+        else:
+            column = np.fromiter((np.nan if v is None else v for v in map(get, samples)), dtype=np.float64, count=count)
+        arrays[name] = column
+    return arrays
+
+
 class DiveLogError(Exception):
     """Base exception for dive log parsing errors."""
     pass
@@ -113,26 +156,19 @@ def extract_dive_segment(
         print(f"   Segment start will be adjusted to 0s")
         segment_start = 0
 
-    # Find samples within segment
-    segment_samples = []
+    # Samples are in time order, so the segment bounds are found by binary search
+    time_of = attrgetter("time")
+    first = bisect_left(samples, segment_start, key=time_of)
+    after = bisect_right(samples, segment_end, key=time_of)
 
     # Include one sample before segment for interpolation
-    for i, sample in enumerate(samples):
-        if sample.time >= segment_start:
-            if i > 0:
-                segment_samples.append(samples[i-1])
-            break
+    segment_samples = samples[first - 1:first] if first > 0 else []
 
     # Include all samples within segment
-    for sample in samples:
-        if segment_start <= sample.time <= segment_end:
-            segment_samples.append(sample)
+    segment_samples.extend(samples[first:after])
 
     # Include one sample after segment for interpolation
-    for sample in samples:
-        if sample.time > segment_end:
-            segment_samples.append(sample)
-            break
+    segment_samples.extend(samples[after:after + 1])
 
     # Validate we got samples
     if not segment_samples:
@@ -144,32 +180,224 @@ def extract_dive_segment(
 def _parse_time_to_seconds(t: str | None) -> int:
     if t is None:
         raise NoDiveDataError("Time string cannot be None")
-    t = t.replace(" min", "").strip()
-    parts = list(map(int, t.split(":")))
+    # int() ignores surrounding whitespace, so the parts need no strip() or intermediate list
+    parts = t.replace(" min", "").split(":")
     if len(parts) == 2:
-        return parts[0] * 60 + parts[1]
+        return int(parts[0]) * 60 + int(parts[1])
     elif len(parts) == 3:
-        return parts[0] * 3600 + parts[1] * 60 + parts[2]
+        return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+    for part in parts:
+        int(part)  # Other shapes count as zero but must still be numeric
     return 0
 
 
+def _num(value: str) -> float:
+    """Parse a Subsurface quantity such as "12.3 m" or "1.02 bar" (number before the unit)."""
+    return float(value.partition(" ")[0])
+
+
+def _minutes(value: str) -> int:
+    """Parse the whole minutes of a Subsurface duration such as "5:00 min"."""
+    return int(value.partition(" ")[0].partition(":")[0])
+
+
+# All DiveSample field values in declaration order, for positional construction
+_sample_values = attrgetter(*(f.name for f in fields(DiveSample)))
+
+
+def _snapshot(sample: DiveSample) -> DiveSample:
+    """Copy a sample for the profile.
+
+    The pressure and ppo2_sensors lists are shared with the copy rather than cloned, so
+    once a sample has been snapshotted its lists must be replaced, not modified (copy on
+    write). Every other field is an immutable scalar.
+    """
+    # Positional construction is much cheaper than dataclasses.replace() or copy.deepcopy()
+    return DiveSample(*_sample_values(sample))
+
+
+# Subsurface sample attribute -> (DiveSample field, parse function)
+_SUBSURFACE_SAMPLE_FIELDS = (
+    ("depth", "depth", _num),
+    ("ndl", "ndl", _minutes),
+    ("tts", "tts", _minutes),
+    ("temp", "temperature", _num),
+    ("stopdepth", "stop_depth", _num),
+    ("stoptime", "stop_time", _minutes),
+    ("dc_supplied_ppo2", "ppo2", _num),
+)
+
+
+def _read_subsurface_samples(samples: List[Dict[str, str]], last: DiveSample, cylinder_count: int) -> List[DiveSample]:
+    """Build the profile from Subsurface sample attributes, carrying values forward.
+
+    Each sample updates the carried-forward values from the attributes it contains and
+    appends a snapshot. Attributes that no sample in the log has are never checked.
+
+    Args:
+        samples: Attribute dicts of the sample elements, in order
+        last: Initial values; updated in place as samples are read
+        cylinder_count: Number of cylinders (pressure0..pressureN-1 attributes)
+
+    Returns:
+        One DiveSample per sample element
+    """
+    present = frozenset().union(*samples)
+    scalar_fields = tuple(entry for entry in _SUBSURFACE_SAMPLE_FIELDS if entry[0] in present)
+    list_fields = tuple(
+        entry for entry in (
+            *((f"sensor{i+1}", "ppo2_sensors", i) for i in range(3)),  # Typically 3 sensors for CCR
+            *((f"pressure{i}", "pressure", i) for i in range(cylinder_count)),
+        )
+        if entry[0] in present
+    )
+
+    profile_data: List[DiveSample] = []
+    # Pressures and sensor readings change far less often than once per sample, so
+    # consecutive samples share one list and it is only copied before an update
+    # (copy on write, see _snapshot). Names of lists copied since the last snapshot:
+    copied: set = set()
+    for attrs in samples:
+        last.time = _parse_time_to_seconds(attrs.get("time"))
+        for key, name, parse in scalar_fields:
+            if key in attrs:
+                setattr(last, name, parse(attrs[key]))
+        for key, name, index in list_fields:
+            value = attrs.get(key)
+            if value is None:
+                continue
+            try:
+                number = _num(value)
+            except ValueError:
+                continue
+            values = getattr(last, name)
+            if name not in copied:
+                values = values[:]
+                setattr(last, name, values)
+                copied.add(name)
+            values[index] = number
+        profile_data.append(_snapshot(last))
+        if copied:
+            copied = set()
+    return profile_data
+
+
+def _expat_parse(
+    file_path: str,
+    start: Callable[[str, Dict[str, str]], None],
+    end: Callable[[str], None],
+    data: Optional[Callable[[str], None]] = None,
+    encoding: Optional[str] = None
+) -> None:
+    """Stream an XML file through expat, calling back for each element.
+
+    Namespaced names are reported as "uri}name", so like ElementTree they never match plain tags.
+
+    Args:
+        file_path: Path to the XML file
+        start: Called with the tag and attribute dict of each start tag
+        end: Called with the tag of each end tag
+        data: Optional callback for character data
+        encoding: Optional encoding overriding the one in the XML declaration
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the file is not well-formed XML
+    """
+    xml_parser = expat.ParserCreate(encoding, namespace_separator="}")
+    xml_parser.buffer_text = True  # Deliver each run of text in one call
+    xml_parser.StartElementHandler = start
+    xml_parser.EndElementHandler = end
+    if data is not None:
+        xml_parser.CharacterDataHandler = data
+    try:
+        with open(file_path, "rb") as f:
+            xml_parser.ParseFile(f)
+    except expat.ExpatError as e:
+        error = ET.ParseError(f"{expat.ErrorString(e.code)}: line {e.lineno}, column {e.offset}")
+        error.code = e.code
+        error.position = (e.lineno, e.offset)
+        raise error from None
+
+
 class SubsurfaceParser(DiveParser):
     """Parser for Subsurface (.ssrf) XML dive logs."""
 
+    @staticmethod
+    def _read_dive(file_path: str) -> Dict[str, Any]:
+        """Stream the log through expat and collect what parse() needs from the first dive.
+
+        Only the dive's attributes, its cylinder count and the attributes of the samples
+        and events of its first divecomputer are kept. No elements are built, so neither
+        the document tree nor the file contents are ever held in memory.
+
+        Returns:
+            Dict with dive_count, dive_attrs, cylinder_count, has_divecomputer,
+            samples and events (lists of attribute dicts)
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the file is not well-formed XML
+        """
+        result: Dict[str, Any] = {
+            "dive_count": 0,
+            "dive_attrs": {},
+            "cylinder_count": 0,
+            "has_divecomputer": False,
+            "samples": [],
+            "events": [],
+        }
+        samples = result["samples"]
+        events = result["events"]
+        stack: List[str] = []
+        dive_level = -1  # Depth of the first dive, -1 until it is found
+        in_dive = False
+        in_divecomputer = False
+
+        def start(tag, attrs):
+            nonlocal dive_level, in_dive, in_divecomputer
+            level = len(stack)
+            if in_divecomputer and level == dive_level + 2:
+                if tag == "sample":
+                    samples.append(attrs)
+                elif tag == "event":
+                    events.append(attrs)
+            # Same dives as root.findall(".//dives/dive")
+            elif tag == "dive" and level >= 2 and stack[-1] == "dives":
+                result["dive_count"] += 1
+                if dive_level < 0:
+                    dive_level = level
+                    in_dive = True
+                    result["dive_attrs"] = attrs
+            elif in_dive and level == dive_level + 1:
+                if tag == "cylinder":
+                    result["cylinder_count"] += 1
+                elif tag == "divecomputer" and not result["has_divecomputer"]:
+                    result["has_divecomputer"] = True
+                    in_divecomputer = True
+            stack.append(tag)
+
+        def end(tag):
+            nonlocal in_dive, in_divecomputer
+            stack.pop()
+            level = len(stack)
+            if level == dive_level + 1:
+                in_divecomputer = False
+            elif level == dive_level:
+                in_dive = False
+
+        _expat_parse(file_path, start, end)
+        return result
+
     def parse(self, file_path: str) -> DiveData:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        dive = self._read_dive(file_path)
 
-        dives = root.findall(".//dives/dive")
-        if not dives:
+        if not dive["dive_count"]:
             raise NoDiveDataError()
-        if len(dives) > 1:
-            raise MultipleDivesError(len(dives))
-        dive = dives[0]
+        if dive["dive_count"] > 1:
+            raise MultipleDivesError(dive["dive_count"])
 
         # Extract dive start time from date and time attributes
-        date_str = dive.get("date", "")  # Format: YYYY-MM-DD
-        time_str = dive.get("time", "")  # Format: HH:MM:SS
+        date_str = dive["dive_attrs"].get("date", "")  # Format: YYYY-MM-DD
+        time_str = dive["dive_attrs"].get("time", "")  # Format: HH:MM:SS
 
         if not date_str or not time_str:
             raise NoDiveDataError("Dive date or time not found in dive log")
@@ -183,18 +411,15 @@ class SubsurfaceParser(DiveParser):
         except ValueError as e:
             raise NoDiveDataError(f"Could not parse dive date/time: {e}")
 
-        cylinders = dive.findall("cylinder")
+        cylinder_count = dive["cylinder_count"]
 
-        divecomputer = dive.find("divecomputer")
-        if divecomputer is None:
+        if not dive["has_divecomputer"]:
             raise NoDiveDataError("No dive computer data found in the dive log. Please check that the dive log contains dive computer information.")
 
-        samples = divecomputer.findall("sample")
+        samples = dive["samples"]
         if not samples:
             raise NoDiveDataError("No dive samples found in the dive log. Please check that the dive log contains dive profile data.")
 
-        profile_data: List[DiveSample] = []
-
         # Initialize last known values
         last_values: DiveSample = DiveSample(
             time=0,
@@ -204,58 +429,17 @@ class SubsurfaceParser(DiveParser):
             ppo2=None, # TODO implement
         )
         # Initialize pressures list length based on cylinders (if any)
-        if cylinders:
-            last_values.pressure = [None] * len(cylinders)
+        if cylinder_count:
+            last_values.pressure = [None] * cylinder_count
         # Initialize ppo2_sensors list (typically 3 sensors for CCR)
         last_values.ppo2_sensors = [None, None, None]
 
-        for s in samples:
-            attrs = s.attrib
-            time_s = _parse_time_to_seconds(attrs.get("time"))
-
-            # Update last known values only if present in this sample
-            last_values.time = time_s
-            if "depth" in attrs:
-                last_values.depth = float(attrs["depth"].replace(" m", ""))
-            if "ndl" in attrs:
-                last_values.ndl = int(attrs["ndl"].replace(" min", "").split(":")[0])
-            if "tts" in attrs:
-                last_values.tts = int(attrs["tts"].replace(" min", "").split(":")[0])
-            if "temp" in attrs:
-                last_values.temperature = float(attrs["temp"].replace(" C", ""))
-            if "stopdepth" in attrs:
-                last_values.stop_depth = float(attrs["stopdepth"].replace(" m", ""))
-            if "stoptime" in attrs:
-                last_values.stop_time = int(attrs["stoptime"].replace(" min", "").split(":")[0])
-            if "dc_supplied_ppo2" in attrs:
-                last_values.ppo2 = float(attrs["dc_supplied_ppo2"].replace(" bar", ""))
-
-            # Update PPO2 sensors
-            for i in range(3):  # Typically 3 sensors for CCR
-                key = f"sensor{i+1}"
-                if key in attrs:
-                    try:
-                        last_values.ppo2_sensors[i] = float(attrs[key].replace(" bar", ""))
-                    except (ValueError, IndexError):
-                        continue
-
-            # Update tank pressures
-            for i in range(len(cylinders)):
-                key = f"pressure{i}"
-                if key in attrs:
-                    try:
-                        last_values.pressure[i] = float(attrs[key].replace(" bar", ""))
-                    except ValueError:
-                        continue
-
-            # Append a full snapshot of the current state
-            profile_data.append(copy.deepcopy(last_values))
+        profile_data = _read_subsurface_samples(samples, last_values, cylinder_count)
 
         # Parse gas change events and inject into samples
-        events = divecomputer.findall("event")
-        gas_changes = []
+        gas_changes = []  # (time, fractionO2, fractionHe)
 
-        for event in events:
+        for event in dive["events"]:
             if event.get("name") == "gaschange":
                 time_s = _parse_time_to_seconds(event.get("time"))
                 o2_str = event.get("o2")
@@ -264,33 +448,32 @@ class SubsurfaceParser(DiveParser):
                 fraction_o2 = float(o2_str.replace("%", "")) / 100.0 if o2_str else None
                 fraction_he = float(he_str.replace("%", "")) / 100.0 if he_str else None
 
-                gas_changes.append({
-                    "time": time_s,
-                    "fractionO2": fraction_o2,
-                    "fractionHe": fraction_he
-                })
-
-        gas_changes.sort(key=lambda x: x["time"])
-
-        # Inject gas changes into appropriate samples
-        for gas_change in gas_changes:
-            target_time = gas_change["time"]
-
-            # Find the first sample at or after the gas change time and inject gas fractions into the target sample and all subsequent samples
-            target_sample = None
-            for sample in profile_data:
-                if sample.time >= target_time:
-                    target_sample = sample
-                    break
-
-            if target_sample is not None:
-                target_index = profile_data.index(target_sample)
-                for i in range(target_index, len(profile_data)):
-                    profile_data[i].fractionO2 = gas_change["fractionO2"]
-                    profile_data[i].fractionHe = gas_change["fractionHe"]
-
-        print(f"Found {len(gas_changes)} gas change events.")
-        print(f"Parsed {len(profile_data)} samples from dive log.")
+                gas_changes.append((time_s, fraction_o2, fraction_he))
+
+        # By time only, keeping the log order of simultaneous changes (fractions may be None)
+        gas_changes.sort(key=itemgetter(0))
+
+        # Inject gas changes into appropriate samples: each gas applies from the first
+        # sample at or after its time until the next gas change takes over. Gas changes
+        # are sorted, so their first samples are found in a single forward pass.
+        sample_count = len(profile_data)
+        starts = []
+        index = 0
+        for time_s, fraction_o2, fraction_he in gas_changes:
+            while index < sample_count and profile_data[index].time < time_s:
+                index += 1
+            if index == sample_count:
+                break
+            starts.append((index, fraction_o2, fraction_he))
+
+        for n, (start, fraction_o2, fraction_he) in enumerate(starts):
+            end = starts[n + 1][0] if n + 1 < len(starts) else sample_count
+            for i in range(start, end):
+                profile_data[i].fractionO2 = fraction_o2
+                profile_data[i].fractionHe = fraction_he
+
+        logger.info("Found %d gas change events.", len(gas_changes))
+        logger.info("Parsed %d samples from dive log.", len(profile_data))
 
         # Calculate dive end time
         last_sample_time = profile_data[-1].time if profile_data else 0
@@ -316,44 +499,118 @@ class ShearwaterParser(DiveParser):
         """
         self.date_format = date_format
 
+    @staticmethod
+    def _read_log(file_path: str, encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Stream a Shearwater log through expat and collect the start date and the dive log records.
+
+        Each diveLogRecord is reduced to a {tag: text} dict of its children while it is
+        read. No elements are built, so neither the document tree nor the file contents
+        are ever held in memory.
+
+        Args:
+            file_path: Path to the log file
+            encoding: Optional encoding overriding the one in the XML declaration
+
+        Returns:
+            Dict with has_dive_log, start_date (text of the first diveLog's startDate, or
+            None) and records (list of {tag: text} dicts)
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the file is not well-formed XML
+        """
+        result: Dict[str, Any] = {"has_dive_log": False, "start_date": None, "records": []}
+        records = result["records"]
+        stack: List[str] = []
+        dive_log_level = -1  # Depth of the first diveLog, -1 until it is found
+        in_dive_log = False
+        has_start_date = False
+        # Records being read, innermost last, with the depth of their children
+        open_records: List[Any] = []
+        child_level = -1  # Depth of the children of the innermost open record
+        # Element text is the character data before its first child, as in ElementTree
+        text_target: Optional[Dict[str, Optional[str]]] = None
+        text_key = ""
+
+        def start(tag, attrs):
+            nonlocal dive_log_level, in_dive_log, has_start_date, child_level, text_target, text_key
+            level = len(stack)
+            stack.append(tag)
+            if level == child_level:
+                # Most elements are record fields, so handle those first
+                fields = open_records[-1][1]
+                if tag in fields:
+                    text_target = None  # Like find(), the first child with a given tag wins
+                else:
+                    fields[tag] = None
+                    text_target = fields
+                    text_key = tag
+                if tag != "diveLog":
+                    return
+            else:
+                text_target = None
+            # Same element as root.find(".//diveLog")
+            if dive_log_level < 0 and level >= 1 and tag == "diveLog":
+                dive_log_level = level
+                in_dive_log = True
+                result["has_dive_log"] = True
+            elif in_dive_log and level == dive_log_level + 1 and tag == "startDate" and not has_start_date:
+                has_start_date = True
+                text_target = result
+                text_key = "start_date"
+            # Same records as root.findall(".//diveLogRecords/diveLogRecord")
+            elif tag == "diveLogRecord" and level >= 2 and stack[-2] == "diveLogRecords":
+                child_level = level + 1
+                open_records.append((child_level, {}))
+
+        def end(tag):
+            nonlocal in_dive_log, child_level, text_target
+            text_target = None
+            stack.pop()
+            level = len(stack)
+            if level == child_level - 1:
+                records.append(open_records.pop()[1])
+                child_level = open_records[-1][0] if open_records else -1
+            elif level == dive_log_level:
+                in_dive_log = False
+
+        def data(text):
+            if text_target is not None:
+                value = text_target[text_key]
+                text_target[text_key] = text if value is None else value + text
+
+        _expat_parse(file_path, start, end, data, encoding)
+        return result
+
     def parse(self, file_path: str) -> DiveData:
-        # Handle encoding issues with Shearwater XML files
+        # Shearwater exports declare encoding="utf-16" but are written as UTF-8
         try:
-            tree = ET.parse(file_path)
+            log = self._read_log(file_path)
         except ET.ParseError:
-            # Try reading with UTF-8 and fix encoding declaration
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            # Replace incorrect encoding declaration
-            content = content.replace('encoding="utf-16"', 'encoding="utf-8"')
-            tree = ET.fromstring(content)
-
-        root = tree if isinstance(tree, ET.Element) else tree.getroot()
+            log = self._read_log(file_path, encoding="utf-8")
 
         # Extract dive start time from startDate element
-        dive_log = root.find(".//diveLog")
-        if dive_log is None:
+        if not log["has_dive_log"]:
             raise NoDiveDataError("No dive log data found")
 
-        start_date_elem = dive_log.find("startDate")
-        if start_date_elem is None or not start_date_elem.text:
+        start_date = log["start_date"]
+        if not start_date:
             raise NoDiveDataError("Dive start date not found in dive log")
 
         if self.date_format:
             # Use user-provided format override
             format_string = self.date_format
-            print(f"Using custom date format: {format_string}")
+            logger.info("Using custom date format: %s", format_string)
         else:
             # Get format from system locale
             format_string = self._get_regional_date_format()
-            print(f"Using regional date format: {format_string}")
+            logger.info("Using regional date format: %s", format_string)
 
         try:
-            start_time = datetime.strptime(start_date_elem.text, format_string)
+            start_time = datetime.strptime(start_date, format_string)
             start_time = start_time.replace(tzinfo=timezone.utc)
         except ValueError as e:
             raise NoDiveDataError(
-                f"Could not parse dive start date '{start_date_elem.text}' with format '{format_string}': {e}\n"
+                f"Could not parse dive start date '{start_date}' with format '{format_string}': {e}\n"
                 f"The parser uses your system's regional format, but the Shearwater file may use a different format.\n"
                 f"Use --shearwater-date-format to specify the correct format.\n"
                 f"Common formats:\n"
@@ -363,8 +620,7 @@ class ShearwaterParser(DiveParser):
                 f"  EU (24-hour):  --shearwater-date-format '%d/%m/%Y %H:%M:%S'     (e.g., 15/8/2024 16:57:48)"
             )
 
-        # Find dive log records
-        dive_records = root.findall(".//diveLogRecords/diveLogRecord")
+        dive_records = log["records"]
         if not dive_records:
             raise NoDiveDataError("No dive samples found in the dive log. Please check that the dive log contains dive profile data.")
 
@@ -380,95 +636,118 @@ class ShearwaterParser(DiveParser):
         # Initialize ppo2_sensors list (typically 3 sensors for CCR)
         last_values.ppo2_sensors = [None, None, None]
 
-        for record in dive_records:
-            time_ms = record.find("currentTime")
-            if time_ms is None or time_ms.text is None:
+        tank_tags = tuple((i, f"tank{i}pressurePSI") for i in range(4))
+
+        # Most fields repeat the same few texts record after record (gas fractions, stop
+        # depth, temperature, ...), so each distinct text is converted once and shares one
+        # number object. Non-numeric texts ("Not diving", "not available", ...) are cached
+        # as None too, instead of raising ValueError again for every record.
+        shared_floats: Dict[Optional[str], Optional[float]] = {None: None}  # None: field missing
+        shared_ints: Dict[Optional[str], Optional[int]] = {None: None}
+
+        def to_float(text: Optional[str]) -> Optional[float]:
+            if text in shared_floats:
+                return shared_floats[text]
+            try:
+                value = float(text)
+            except ValueError:
+                value = None
+            shared_floats[text] = value
+            return value
+
+        def to_int(text: Optional[str]) -> Optional[int]:
+            if text in shared_ints:
+                return shared_ints[text]
+            try:
+                value = int(text)
+            except ValueError:
+                value = None
+            shared_ints[text] = value
+            return value
+
+        # Tank pressure text -> bar, converted once per distinct text (None if not numeric)
+        tank_bars: Dict[str, Optional[float]] = {}
+        # Tank pressures mostly stay the same from one record to the next, so samples
+        # share the pressure list until a value changes (see _snapshot)
+        pressure_shared = False
+
+        for fields in dive_records:
+            time_ms = fields.get("currentTime")
+            if time_ms is None:
                 raise NoDiveDataError("Dive record missing required currentTime field")
-            last_values.time = int(time_ms.text) // 1000
-
-            depth_elem = record.find("currentDepth")
-            if depth_elem is not None and depth_elem.text is not None:
-                last_values.depth = float(depth_elem.text)
-
-            ndl_elem = record.find("currentNdl")
-            if ndl_elem is not None and ndl_elem.text is not None and ndl_elem.text.isdigit():
-                last_values.ndl = int(ndl_elem.text)
-
-            tts_elem = record.find("ttsMins")
-            if tts_elem is not None and tts_elem.text is not None and tts_elem.text.isdigit():
-                last_values.tts = int(tts_elem.text)
-
-            temp_elem = record.find("waterTemp")
-            if temp_elem is not None and temp_elem.text is not None:
-                try:
-                    last_values.temperature = float(temp_elem.text)
-                except ValueError:
-                    pass
-
-            stop_depth_elem = record.find("firstStopDepth")
-            if stop_depth_elem is not None and stop_depth_elem.text is not None:
-                try:
-                    last_values.stop_depth = float(stop_depth_elem.text)
-                except ValueError:
-                    pass
-
-            stop_time_elem = record.find("firstStopTime")
-            if stop_time_elem is not None and stop_time_elem.text is not None:
-                try:
-                    last_values.stop_time = int(stop_time_elem.text)
-                except ValueError:
-                    pass
-
-            o2_elem = record.find("fractionO2")
-            if o2_elem is not None and o2_elem.text is not None:
-                try:
-                    last_values.fractionO2 = float(o2_elem.text)
-                except ValueError:
-                    pass
-
-            he_elem = record.find("fractionHe")
-            if he_elem is not None and he_elem.text is not None:
-                try:
-                    last_values.fractionHe = float(he_elem.text)
-                except ValueError:
-                    pass
-            ppo2_elem = record.find("averagePPO2")
-            if ppo2_elem is not None and ppo2_elem.text is not None:
-                try:
-                    last_values.ppo2 = float(ppo2_elem.text)
-                except ValueError:
-                    pass
+            last_values.time = int(time_ms) // 1000
+
+            depth = fields.get("currentDepth")
+            if depth is not None:
+                value = to_float(depth)
+                # A non-numeric depth is an error: float() raises the ValueError
+                last_values.depth = value if value is not None else float(depth)
+
+            ndl = fields.get("currentNdl")
+            if ndl is not None and ndl.isdigit():
+                last_values.ndl = int(ndl)
+
+            tts = fields.get("ttsMins")
+            if tts is not None and tts.isdigit():
+                last_values.tts = int(tts)
+
+            value = to_float(fields.get("waterTemp"))
+            if value is not None:
+                last_values.temperature = value
+
+            value = to_float(fields.get("firstStopDepth"))
+            if value is not None:
+                last_values.stop_depth = value
+
+            value = to_int(fields.get("firstStopTime"))
+            if value is not None:
+                last_values.stop_time = value
+
+            value = to_float(fields.get("fractionO2"))
+            if value is not None:
+                last_values.fractionO2 = value
+
+            value = to_float(fields.get("fractionHe"))
+            if value is not None:
+                last_values.fractionHe = value
+
+            value = to_float(fields.get("averagePPO2"))
+            if value is not None:
+                last_values.ppo2 = value
 
             # tank pressures (convert PSI to bar)
-            for i in range(4):
-                tank_elem = record.find(f"tank{i}pressurePSI")
-                if tank_elem is not None and tank_elem.text is not None:
-                    try:
-                        psi_value = float(tank_elem.text)
-                        last_values.pressure[i] = psi_value * 0.0689476
-                    except ValueError:
-                        # Handle non-numeric values like "AI is off"
-                        last_values.pressure[i] = None
-
-            sac_elem = record.find("sac")
-            if sac_elem is not None and sac_elem.text is not None:
-                try:
-                    last_values.sac = float(sac_elem.text)
-                except ValueError:
-                    # Handle non-numeric values like "Not diving"
-                    pass
-
-            gas_time_elem = record.find("gasTime")
-            if gas_time_elem is not None and gas_time_elem.text is not None:
-                try:
-                    last_values.gtr = int(gas_time_elem.text)
-                except ValueError:
-                    # Handle non-numeric values like "not available", "due to deco not available"
-                    pass
-
-            profile_data.append(copy.deepcopy(last_values))
-
-        print(f"Parsed {len(profile_data)} samples from Shearwater dive log.")
+            for i, tag in tank_tags:
+                tank = fields.get(tag)
+                if tank is not None:
+                    if tank in tank_bars:
+                        bar = tank_bars[tank]
+                    else:
+                        try:
+                            bar = float(tank) * 0.0689476
+                        except ValueError:
+                            # Handle non-numeric values like "AI is off"
+                            bar = None
+                        tank_bars[tank] = bar
+                    if bar is not last_values.pressure[i]:
+                        if pressure_shared:
+                            last_values.pressure = last_values.pressure[:]
+                            pressure_shared = False
+                        last_values.pressure[i] = bar
+
+            # Non-numeric values like "Not diving" keep the previous value
+            value = to_float(fields.get("sac"))
+            if value is not None:
+                last_values.sac = value
+
+            # Non-numeric values like "not available", "due to deco not available" keep the previous value
+            value = to_int(fields.get("gasTime"))
+            if value is not None:
+                last_values.gtr = value
+
+            profile_data.append(_snapshot(last_values))
+            pressure_shared = True
+
+        logger.info("Parsed %d samples from Shearwater dive log.", len(profile_data))
 
         # Calculate dive end time
         last_sample_time = profile_data[-1].time if profile_data else 0
@@ -496,6 +775,13 @@ class ShearwaterParser(DiveParser):
         return f"{date_format} {time_format}"
 
 
+# Dive log file extension -> parser factory taking the Shearwater date format override
+PARSER_REGISTRY: Dict[str, Callable[[Optional[str]], DiveParser]] = {
+    ".ssrf": lambda date_format: SubsurfaceParser(),
+    ".xml": lambda date_format: ShearwaterParser(date_format=date_format),
+}
+
+
 def get_parser(file_path: str, shearwater_date_format: Optional[str] = None) -> DiveParser:
     """Get appropriate parser for the given file.
 
@@ -509,12 +795,10 @@ def get_parser(file_path: str, shearwater_date_format: Optional[str] = None) ->
     Raises:
         UnsupportedFormatError: If file format is not supported
     """
-    if file_path.lower().endswith(".ssrf"):
-        return SubsurfaceParser()
-    elif file_path.lower().endswith(".xml"):
-        return ShearwaterParser(date_format=shearwater_date_format)
-    else:
+    make_parser = PARSER_REGISTRY.get(os.path.splitext(file_path)[1].lower())
+    if make_parser is None:
         raise UnsupportedFormatError(file_path)
+    return make_parser(shearwater_date_format)
 
 
 def parse_dive_log(file_path: str, shearwater_date_format: Optional[str] = None) -> DiveData:
@@ -533,3 +817,97 @@ def parse_dive_log(file_path: str, shearwater_date_format: Optional[str] = None)
     """
     parser = get_parser(file_path, shearwater_date_format)
     return parser.parse(file_path)
+
+
+# Bump whenever parser output or the DiveSample/DiveData layout changes so that
+# results cached by earlier versions are ignored.
+PARSE_CACHE_VERSION = 4
+
+
+def _default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "scubaoverlay")
+
+
+class _LogCollector(logging.Handler):
+    """Collect the (level, message) of every record logged while attached."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages: List[tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append((record.levelno, record.getMessage()))
+
+
+def parse_dive_log_cached(
+    file_path: str,
+    shearwater_date_format: Optional[str] = None,
+    cache_dir: Optional[str] = None
+) -> DiveData:
+    """Parse a dive log file, reusing the result of a previous run if the file is unchanged.
+
+    Parsed dive data is pickled under ``cache_dir`` (default ``~/.cache/scubaoverlay``)
+    in one entry per log file, named after its resolved path. The entry stores the
+    file's modification time and size, the effective Shearwater date format and
+    PARSE_CACHE_VERSION, and is overwritten when any of them change, so edited logs
+    don't leave stale entries behind. The parser's status messages (sample counts,
+    date format) are stored with the entry and logged again on a cache hit, so the
+    output is the same either way. Unreadable cache entries are ignored and failures
+    to write the cache never fail the parse.
+
+    Args:
+        file_path: Path to the dive log file
+        shearwater_date_format: Optional date format override for Shearwater XML files
+        cache_dir: Optional cache directory override
+
+    Returns:
+        Parsed dive data
+
+    Raises:
+        UnsupportedFormatError: If file format is not supported
+        DiveLogError: If there are issues parsing the dive log
+    """
+    parser = get_parser(file_path, shearwater_date_format)
+    try:
+        stat = os.stat(file_path)
+        date_format = None
+        if isinstance(parser, ShearwaterParser):
+            # The start time depends on the regional format when no override is given
+            date_format = parser.date_format or parser._get_regional_date_format()
+    except Exception:
+        # Let the parser report missing files / locale problems as usual
+        return parser.parse(file_path)
+
+    stamp = (PARSE_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, date_format)
+    path_hash = hashlib.sha1(os.path.realpath(file_path).encode("utf-8")).hexdigest()
+    cache_path = os.path.join(cache_dir or _default_cache_dir(), path_hash + ".pkl")
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, dive_data, messages = pickle.load(f)
+        if cached_stamp == stamp and isinstance(dive_data, DiveData):
+            logger.info("Using cached parse of %s", file_path)
+            for level, message in messages:
+                logger.log(level, "%s", message)
+            return dive_data
+    except Exception:
+        pass
+
+    collector = _LogCollector()
+    logger.addHandler(collector)
+    try:
+        dive_data = parser.parse(file_path)
+    finally:
+        logger.removeHandler(collector)
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((stamp, dive_data, collector.messages), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass
+
+    return dive_data
@@ -7,11 +7,13 @@ compositing with dive footage in video editing software.
 
 import cv2
 import numpy as np
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
-from parser import DiveSample
+from parser import DiveSample, samples_to_arrays
 from font_utils import get_font, get_font_name
+from video_writer import OverlayVideoWriter
 
 
 # Unit conversion constants (metric to imperial)
@@ -46,13 +48,22 @@ def _format_gas_mixture(fraction_o2: Optional[float], fraction_he: Optional[floa
     return f"{o2_percent}/{he_percent}"
 
 
-@dataclass
+@dataclass(slots=True)
 class _CompiledProfileTemplate:
     """Pre-compiled profile template with static graph background."""
     base_img: Image.Image  # Static background with profile line
-    graph_config: Dict[str, Any]  # Graph dimensions, colors, etc.
+    base_frame: np.ndarray  # base_img as a read-only RGBA array, copied for each frame
+    indicator_mask: np.ndarray  # Pixels of the indicator dot, drawn once by PIL
+    graph_x: int  # Graph area position and size in the frame
+    graph_y: int
+    graph_width: int
+    graph_height: int
+    indicator_color: Tuple[int, int, int]  # RGB
+    indicator_size: int  # Indicator dot radius in pixels
     frame_size: Tuple[int, int]
-    dive_samples: List[DiveSample]  # Cached for position lookup
+    dive_samples: List[DiveSample]  # Samples the graph was compiled from
+    sample_times: np.ndarray  # Sample times, for binary search of the current sample
+    sample_xy: np.ndarray  # (x, y) graph position of each sample, where the indicator is drawn
     max_depth: float  # Cached for coordinate transformations
     total_duration: int  # Total dive/segment duration in seconds
 
@@ -93,96 +104,123 @@ def _depth_to_y(depth: float, max_depth: float, graph_y: int, graph_height: int)
     return graph_y + int((depth / padded_max) * graph_height)
 
 
-def _render_profile_line(
-    draw: ImageDraw.ImageDraw,
-    samples: List[DiveSample],
+def _graph_coordinates(
+    times: np.ndarray,
+    depths: np.ndarray,
     total_duration: int,
     max_depth: float,
     graph_x: int,
     graph_y: int,
     graph_width: int,
-    graph_height: int,
-    line_color: Tuple[int, int, int],
-    line_thickness: int,
-    depth_converter: Optional[callable] = None
-) -> None:
-    """Draw depth profile line connecting all dive samples.
+    graph_height: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert arrays of times and depths to graph coordinates (vectorised _time_to_x/_depth_to_y).
 
     Args:
-        draw: PIL ImageDraw object
-        samples: List of dive samples
+        times: Times in seconds
+        depths: Depths (already converted if needed)
         total_duration: Total duration in seconds
         max_depth: Maximum depth (already converted if needed)
         graph_x: Graph area X offset
         graph_y: Graph area Y offset
         graph_width: Graph area width
         graph_height: Graph area height
+
+    Returns:
+        (xs, ys) integer arrays with one coordinate per time/depth pair
+    """
+    # Same arithmetic as the scalar helpers; astype() truncates like int()
+    if total_duration <= 0:
+        xs = np.full(len(times), graph_x, dtype=np.int64)
+    else:
+        xs = graph_x + ((times / total_duration) * graph_width).astype(np.int64)
+    if max_depth <= 0:
+        ys = np.full(len(depths), graph_y, dtype=np.int64)
+    else:
+        ys = graph_y + ((depths / (max_depth * 1.1)) * graph_height).astype(np.int64)
+    return xs, ys
+
+
+def _load_font(font_name: str, size: int) -> ImageFont.ImageFont:
+    """Load a font by name, falling back to PIL's default font if it is unavailable."""
+    try:
+        return get_font(font_name, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+def _render_profile_line(
+    draw: ImageDraw.ImageDraw,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    line_color: Tuple[int, int, int],
+    line_thickness: int
+) -> None:
+    """Draw depth profile line connecting all dive samples.
+
+    Args:
+        draw: PIL ImageDraw object
+        xs: Sample X-coordinates from _graph_coordinates()
+        ys: Sample Y-coordinates from _graph_coordinates()
         line_color: RGB tuple for line color
         line_thickness: Line thickness in pixels
-        depth_converter: Optional function to convert depth units
     """
-    if not samples:
+    if len(xs) == 0:
         return
 
-    # Build list of (x, y) coordinates for all samples
-    coordinates = []
-    for sample in samples:
-        depth = sample.depth
-        if depth_converter:
-            depth = depth_converter(depth)
-
-        x = _time_to_x(int(sample.time), total_duration, graph_x, graph_width)
-        y = _depth_to_y(depth, max_depth, graph_y, graph_height)
-        coordinates.append((x, y))
-
     # Draw line connecting all points
-    if len(coordinates) >= 2:
-        draw.line(coordinates, fill=line_color, width=line_thickness)
-    elif len(coordinates) == 1:
+    if len(xs) >= 2:
+        # Flat [x0, y0, x1, y1, ...] list
+        draw.line(np.column_stack((xs, ys)).ravel().tolist(), fill=line_color, width=line_thickness)
+    else:
         # Single point - draw small circle
-        x, y = coordinates[0]
+        x, y = int(xs[0]), int(ys[0])
         r = line_thickness
         draw.ellipse([(x-r, y-r), (x+r, y+r)], fill=line_color)
 
 
-def _render_position_indicator(
-    draw: ImageDraw.ImageDraw,
-    current_sample: DiveSample,
-    total_duration: int,
-    max_depth: float,
-    graph_x: int,
-    graph_y: int,
-    graph_width: int,
-    graph_height: int,
-    indicator_color: Tuple[int, int, int],
-    indicator_size: int,
-    depth_converter: Optional[callable] = None
-) -> None:
-    """Draw position indicator dot at current dive time.
+def _indicator_mask(radius: int) -> np.ndarray:
+    """Rasterize the indicator dot once as a boolean mask of its (2r+1)x(2r+1) box.
 
-    Args:
-        draw: PIL ImageDraw object
-        current_sample: Current dive sample
-        total_duration: Total duration in seconds
-        max_depth: Maximum depth (already converted if needed)
-        graph_x: Graph area X offset
-        graph_y: Graph area Y offset
-        graph_width: Graph area width
-        graph_height: Graph area height
-        indicator_color: RGB tuple for indicator color
-        indicator_size: Radius of indicator in pixels
-        depth_converter: Optional function to convert depth units
+    PIL fills the same pixels for an ellipse wherever its box is placed, so stamping
+    this mask gives exactly what draw.ellipse() would on every frame.
     """
-    depth = current_sample.depth
-    if depth_converter:
-        depth = depth_converter(depth)
+    size = 2 * radius + 1
+    mask_img = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask_img).ellipse([(0, 0), (2 * radius, 2 * radius)], fill=255)
+    return np.asarray(mask_img) > 0
 
-    x = _time_to_x(int(current_sample.time), total_duration, graph_x, graph_width)
-    y = _depth_to_y(depth, max_depth, graph_y, graph_height)
 
-    # Draw circle
-    r = indicator_size
-    draw.ellipse([(x-r, y-r), (x+r, y+r)], fill=indicator_color)
+def _render_position_indicator(
+    frame: np.ndarray,
+    x: int,
+    y: int,
+    indicator_color: Tuple[int, ...],
+    indicator_mask: np.ndarray
+) -> Optional[Tuple[slice, slice]]:
+    """Draw position indicator dot centred on the current sample's graph position.
+
+    Args:
+        frame: Frame array to draw on (RGBA or BGR)
+        x: Indicator centre X-coordinate
+        y: Indicator centre Y-coordinate
+        indicator_color: Indicator color in the frame's channel order
+        indicator_mask: Indicator dot mask from _indicator_mask()
+
+    Returns:
+        The (rows, columns) region of frame that was drawn on, or None if the dot
+        lies entirely outside the frame
+    """
+    # Stamp the circle, clipped to the frame
+    size = indicator_mask.shape[0]
+    left, top = x - size // 2, y - size // 2
+    x0, y0 = max(left, 0), max(top, 0)
+    x1, y1 = min(left + size, frame.shape[1]), min(top + size, frame.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return None
+    mask = indicator_mask[y0 - top:y1 - top, x0 - left:x1 - left]
+    frame[y0:y1, x0:x1][mask] = indicator_color
+    return slice(y0, y1), slice(x0, x1)
 
 
 def _render_gas_changes(
@@ -247,16 +285,17 @@ def _render_gas_changes(
     label_size = label_font_config.get("size", 14)
     label_position = gas_config.get("label_position", "above")
 
-    try:
-        font = get_font(label_font_config.get("name", "Arial"), label_size)
-    except:
-        font = ImageFont.load_default()
+    font = _load_font(label_font_config.get("name", "Arial"), label_size)
 
     # Prepare icon font for markers
-    try:
-        icon_font = get_font(marker_config.get("font", "Arial"), marker_size)
-    except:
-        icon_font = ImageFont.load_default()
+    icon_font = _load_font(marker_config.get("font", "Arial"), marker_size)
+
+    # The marker is the same for every gas change, and labels repeat whenever a gas
+    # is switched back to, so measure each text only once
+    icon_bbox = draw.textbbox((0, 0), marker_icon, font=icon_font)
+    icon_width = icon_bbox[2] - icon_bbox[0]
+    icon_height = icon_bbox[3] - icon_bbox[1]
+    label_sizes = {}
 
     # Render each gas change
     for gc in gas_changes:
@@ -269,9 +308,6 @@ def _render_gas_changes(
         y_depth = _depth_to_y(depth, max_depth, graph_y, graph_height)
 
         # Draw icon marker at the depth where gas change occurred
-        icon_bbox = draw.textbbox((0, 0), marker_icon, font=icon_font)
-        icon_width = icon_bbox[2] - icon_bbox[0]
-        icon_height = icon_bbox[3] - icon_bbox[1]
         icon_x = x - icon_width // 2
         icon_y = y_depth - icon_height // 2
         draw.text((icon_x, icon_y), marker_icon, fill=marker_color, font=icon_font)
@@ -281,9 +317,10 @@ def _render_gas_changes(
             gas_label = _format_gas_mixture(gc["o2"], gc["he"])
 
             # Get text size for positioning
-            bbox = draw.textbbox((0, 0), gas_label, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
+            if gas_label not in label_sizes:
+                bbox = draw.textbbox((0, 0), gas_label, font=font)
+                label_sizes[gas_label] = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+            text_width, text_height = label_sizes[gas_label]
 
             # Position label relative to the icon
             if label_position == "above":
@@ -299,21 +336,23 @@ def _render_gas_changes(
 
 def _render_deco_ceiling(
     draw: ImageDraw.ImageDraw,
-    samples: List[DiveSample],
+    times: np.ndarray,
+    ceiling_depths: np.ndarray,
     total_duration: int,
     max_depth: float,
     graph_x: int,
     graph_y: int,
     graph_width: int,
     graph_height: int,
-    ceiling_config: Dict[str, Any],
-    depth_converter: Optional[callable] = None
+    ceiling_config: Dict[str, Any]
 ) -> None:
     """Render decompression ceiling as filled area or line.
 
     Args:
         draw: PIL ImageDraw object
-        samples: List of dive samples
+        times: Sample times in seconds
+        ceiling_depths: Ceiling depth of each sample, 0 where there is none (already
+            converted if needed)
         total_duration: Total duration in seconds
         max_depth: Maximum depth
         graph_x: Graph area X offset
@@ -321,80 +360,40 @@ def _render_deco_ceiling(
         graph_width: Graph area width
         graph_height: Graph area height
         ceiling_config: Deco ceiling configuration from template
-        depth_converter: Optional function to convert depth units
     """
     if not ceiling_config.get("show", False):
         return
 
-    # Extract ceiling depths from samples
-    ceiling_points = []
-    has_nonzero_ceiling = False
-
-    for sample in samples:
-        ceiling_depth = sample.stop_depth if sample.stop_depth else 0.0
-
-        # Track if there's any actual ceiling (non-zero depth)
-        if ceiling_depth > 0:
-            has_nonzero_ceiling = True
-
-        # Convert depth if needed
-        if depth_converter:
-            ceiling_depth = depth_converter(ceiling_depth)
-
-        time_sec = int(sample.time)
-        x = _time_to_x(time_sec, total_duration, graph_x, graph_width)
-        y = _depth_to_y(ceiling_depth, max_depth, graph_y, graph_height)
-
-        ceiling_points.append((x, y))
-
     # Don't render if no ceiling points or all ceilings are at 0 (surface)
-    if not ceiling_points or not has_nonzero_ceiling:
+    if not (ceiling_depths > 0).any():
         return
 
+    xs, ys = _graph_coordinates(
+        times, ceiling_depths, total_duration, max_depth, graph_x, graph_y, graph_width, graph_height
+    )
+    ceiling_points = list(zip(xs.tolist(), ys.tolist()))
+
     # Get rendering style
     style = ceiling_config.get("style", "filled")
 
     # Render filled area
     if style in ("filled", "both"):
-        fill_color_hex = ceiling_config.get("fill_color", "#FF000030")
-
-        # Parse RGBA hex color
-        if len(fill_color_hex) == 9:  # #RRGGBBAA
-            r = int(fill_color_hex[1:3], 16)
-            g = int(fill_color_hex[3:5], 16)
-            b = int(fill_color_hex[5:7], 16)
-            a = int(fill_color_hex[7:9], 16)
-            fill_color = (r, g, b, a)
-        else:  # #RRGGBB - default to 50% opacity
-            fill_color = hex_to_rgb(fill_color_hex) + (128,)
+        # #RRGGBBAA, or #RRGGBB at 50% opacity
+        fill_color = hex_to_rgba(ceiling_config.get("fill_color", "#FF000030"), 128)
 
         # Build polygon segments only where ceiling is below surface
-        # Split into separate polygons where ceiling depth > 0
-        current_segment = []
-
-        for i, (x, y) in enumerate(ceiling_points):
-            if y > graph_y:  # Ceiling is below surface (has depth)
-                if not current_segment:
-                    # Start new segment - add surface point at this x
-                    current_segment.append((x, graph_y))
-                current_segment.append((x, y))
-            else:
-                # Ceiling at surface - close current segment if exists
-                if current_segment:
-                    # Add surface point at previous x and close
-                    prev_x = ceiling_points[i-1][0] if i > 0 else x
-                    current_segment.append((prev_x, graph_y))
-                    # Draw this segment
-                    if len(current_segment) >= 3:
-                        draw.polygon(current_segment, fill=fill_color)
-                    current_segment = []
-
-        # Close final segment if exists
-        if current_segment:
-            last_x = ceiling_points[-1][0]
-            current_segment.append((last_x, graph_y))
-            if len(current_segment) >= 3:
-                draw.polygon(current_segment, fill=fill_color)
+        # Split into separate polygons for each run of points with ceiling depth > 0
+        below_surface = np.concatenate(([False], ys > graph_y, [False]))
+        edges = np.diff(below_surface.astype(np.int8))
+        run_starts = np.flatnonzero(edges == 1).tolist()
+        run_ends = np.flatnonzero(edges == -1).tolist()
+
+        for start, end in zip(run_starts, run_ends):
+            # Close each run with surface points at its first and last x
+            segment = [(ceiling_points[start][0], graph_y)]
+            segment += ceiling_points[start:end]
+            segment.append((ceiling_points[end - 1][0], graph_y))
+            draw.polygon(segment, fill=fill_color)
 
     # Render border line
     if style in ("line", "both"):
@@ -404,7 +403,7 @@ def _render_deco_ceiling(
 
         # Draw line connecting ceiling points (only if there's variation from surface)
         # Filter out points that are at the surface to avoid drawing a line at y=0
-        non_surface_points = [(x, y) for x, y in ceiling_points if y != graph_y]
+        non_surface_points = [ceiling_points[i] for i in np.flatnonzero(ys != graph_y).tolist()]
 
         if len(non_surface_points) > 1:
             draw.line(non_surface_points, fill=border_color, width=border_thickness)
@@ -494,10 +493,7 @@ def _render_axis_labels(
             font_size = label_font_config.get("size", 14)
             font_color = hex_to_rgb(label_font_config.get("color", "#FFFFFF"))
 
-            try:
-                font = get_font(label_font_config.get("name", "Arial"), font_size)
-            except:
-                font = ImageFont.load_default()
+            font = _load_font(label_font_config.get("name", "Arial"), font_size)
 
             padded_max = max_depth * 1.1
             depth = 0
@@ -523,10 +519,7 @@ def _render_axis_labels(
             font_size = label_font_config.get("size", 18)
             font_color = hex_to_rgb(label_font_config.get("color", "#FFFFFF"))
 
-            try:
-                font = get_font(label_font_config.get("name", "Arial"), font_size)
-            except:
-                font = ImageFont.load_default()
+            font = _load_font(label_font_config.get("name", "Arial"), font_size)
 
             # Create a temporary image for rotated text
             bbox = draw.textbbox((0, 0), label_text, font=font)
@@ -563,10 +556,7 @@ def _render_axis_labels(
             font_size = label_font_config.get("size", 14)
             font_color = hex_to_rgb(label_font_config.get("color", "#FFFFFF"))
 
-            try:
-                font = get_font(label_font_config.get("name", "Arial"), font_size)
-            except:
-                font = ImageFont.load_default()
+            font = _load_font(label_font_config.get("name", "Arial"), font_size)
 
             time = 0
 
@@ -601,10 +591,7 @@ def _render_axis_labels(
             font_size = label_font_config.get("size", 18)
             font_color = hex_to_rgb(label_font_config.get("color", "#FFFFFF"))
 
-            try:
-                font = get_font(label_font_config.get("name", "Arial"), font_size)
-            except:
-                font = ImageFont.load_default()
+            font = _load_font(label_font_config.get("name", "Arial"), font_size)
 
             # Position axis label at bottom center
             bbox = draw.textbbox((0, 0), label_text, font=font)
@@ -617,10 +604,20 @@ def _render_axis_labels(
                      label_text, fill=font_color, font=font)
 
 
+@lru_cache(maxsize=128)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """Convert hex color string to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    r, g, b = bytes.fromhex(hex_color.lstrip('#')[:6])
+    return r, g, b
+
+
+@lru_cache(maxsize=128)
+def hex_to_rgba(hex_color: str, default_alpha: int = 255) -> Tuple[int, int, int, int]:
+    """Convert #RRGGBBAA hex color string to RGBA tuple (default_alpha for #RRGGBB)."""
+    if len(hex_color) == 9:
+        r, g, b, a = bytes.fromhex(hex_color[1:])
+        return r, g, b, a
+    return hex_to_rgb(hex_color) + (default_alpha,)
 
 
 def compile_profile_template(
@@ -683,6 +680,15 @@ def compile_profile_template(
     # Create depth converter if needed
     depth_converter = (lambda d: d * _M_TO_FT) if use_imperial else None
 
+    # Sample columns shared by the renderers, with depths in display units
+    columns = samples_to_arrays(dive_samples, ("time", "depth", "stop_depth"))
+    sample_times = columns["time"]
+    depths = columns["depth"]
+    ceiling_depths = np.nan_to_num(columns["stop_depth"], nan=0.0)
+    if depth_converter:
+        depths = depth_converter(depths)
+        ceiling_depths = depth_converter(ceiling_depths)
+
     # Create base image
     bg_color = hex_to_rgb(template.get("background_color", "#00FF00"))
     base_img = Image.new("RGBA", frame_size, bg_color + (255,))
@@ -746,31 +752,22 @@ def compile_profile_template(
     if deco_ceiling_config.get("show", False):
         _render_deco_ceiling(
             draw,
-            dive_samples,
+            sample_times,
+            ceiling_depths,
             duration,
             max_depth,
             graph_x,
             graph_y,
             graph_width,
             graph_height,
-            deco_ceiling_config,
-            depth_converter
+            deco_ceiling_config
         )
 
-    # Render static profile line
-    _render_profile_line(
-        draw,
-        dive_samples,
-        duration,
-        max_depth,
-        graph_x,
-        graph_y,
-        graph_width,
-        graph_height,
-        line_color,
-        line_thickness,
-        depth_converter
+    # Render static profile line; the same sample positions place the indicator later
+    xs, ys = _graph_coordinates(
+        sample_times, depths, duration, max_depth, graph_x, graph_y, graph_width, graph_height
     )
+    _render_profile_line(draw, xs, ys, line_color, line_thickness)
 
     # Render gas changes if configured (after profile line)
     gas_changes_config = graph.get("gas_changes", {})
@@ -789,26 +786,56 @@ def compile_profile_template(
         )
 
     # Store configuration for dynamic rendering
-    graph_config = {
-        "graph_x": graph_x,
-        "graph_y": graph_y,
-        "graph_width": graph_width,
-        "graph_height": graph_height,
-        "indicator_color": hex_to_rgb(graph.get("indicator", {}).get("color", "#FF0000")),
-        "indicator_size": graph.get("indicator", {}).get("size", 12),
-        "depth_converter": depth_converter
-    }
+    indicator_config = graph.get("indicator", {})
+    indicator_size = indicator_config.get("size", 12)
 
     return _CompiledProfileTemplate(
         base_img=base_img,
-        graph_config=graph_config,
+        base_frame=np.asarray(base_img),
+        indicator_mask=_indicator_mask(indicator_size),
+        graph_x=graph_x,
+        graph_y=graph_y,
+        graph_width=graph_width,
+        graph_height=graph_height,
+        indicator_color=hex_to_rgb(indicator_config.get("color", "#FF0000")),
+        indicator_size=indicator_size,
         frame_size=frame_size,
         dive_samples=dive_samples,
+        sample_times=sample_times,
+        sample_xy=np.column_stack((xs, ys)),
         max_depth=max_depth,
         total_duration=duration
     )
 
 
+def _current_sample_index(compiled: _CompiledProfileTemplate, current_time: int) -> int:
+    """Find the latest sample with time <= current_time (the first sample if there is none)."""
+    index = int(np.searchsorted(compiled.sample_times, current_time, side="right")) - 1
+    return max(index, 0)
+
+
+def _draw_indicator(
+    compiled: _CompiledProfileTemplate,
+    sample_index: int,
+    frame: np.ndarray,
+    indicator_color: Tuple[int, ...]
+) -> Optional[Tuple[slice, slice]]:
+    """Draw the position indicator for a sample onto a background frame.
+
+    Args:
+        compiled: Pre-compiled profile template
+        sample_index: Index of the current sample (see _current_sample_index)
+        frame: Background frame to draw on in place (RGBA, or already converted to
+            another channel order)
+        indicator_color: Indicator color in the channel order of frame
+
+    Returns:
+        The region of frame that was drawn on (see _render_position_indicator)
+    """
+    x, y = compiled.sample_xy[sample_index].tolist()
+    return _render_position_indicator(frame, x, y, indicator_color, compiled.indicator_mask)
+
+
 def render_profile_frame(
     compiled: _CompiledProfileTemplate,
     current_time: int
@@ -822,39 +849,14 @@ def render_profile_frame(
     Returns:
         Frame as numpy array (RGBA)
     """
-    # Copy static background
-    img = compiled.base_img.copy()
-    draw = ImageDraw.Draw(img)
-
-    # Find current sample (latest sample with time <= current_time)
-    current_sample = None
-    for sample in compiled.dive_samples:
-        if sample.time <= current_time:
-            current_sample = sample
-        else:
-            break
-
-    if current_sample is None and compiled.dive_samples:
-        # Use first sample if current_time is before all samples
-        current_sample = compiled.dive_samples[0]
-
-    # Render position indicator
-    if current_sample:
-        _render_position_indicator(
-            draw,
-            current_sample,
-            compiled.total_duration,
-            compiled.max_depth,
-            compiled.graph_config["graph_x"],
-            compiled.graph_config["graph_y"],
-            compiled.graph_config["graph_width"],
-            compiled.graph_config["graph_height"],
-            compiled.graph_config["indicator_color"],
-            compiled.graph_config["indicator_size"],
-            compiled.graph_config["depth_converter"]
-        )
-
-    return np.array(img)
+    frame = compiled.base_frame.copy()
+    _draw_indicator(
+        compiled,
+        _current_sample_index(compiled, current_time),
+        frame,
+        compiled.indicator_color + (255,)
+    )
+    return frame
 
 
 def generate_profile_overlay_video(
@@ -900,32 +902,40 @@ def generate_profile_overlay_video(
         0  # No time offset for rendering full profile
     )
 
-    # Setup video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, resolution)
+    # Frames only differ by the indicator, so convert the background to BGR once and
+    # keep drawing on one working frame, restoring the previous dot's region from the
+    # background instead of copying the whole frame every second
+    base_bgr = cv2.cvtColor(compiled.base_frame, cv2.COLOR_RGBA2BGR)
+    indicator_bgr = compiled.indicator_color[::-1]
+    frame_bgr = base_bgr.copy()
+    indicator_region = None
+    last_index = None
 
     print(f"Generating {total_seconds * fps} frames in {total_seconds} seconds...")
     progress_step = max(1, total_seconds // 10)
 
-    # Render frames
-    for sec in range(total_seconds):
-        # Calculate actual dive time for sample lookup
-        dive_time = sec + time_offset
-
-        # Render frame with position indicator at current time
-        frame_rgba = render_profile_frame(compiled, dive_time)
-        frame_bgr = cv2.cvtColor(frame_rgba, cv2.COLOR_RGBA2BGR)
-
-        # Duplicate frame for FPS
-        for _ in range(fps):
-            out.write(frame_bgr)
-
-        # Progress reporting
-        if (sec + 1) % progress_step == 0 or sec == total_seconds - 1:
-            percent = (sec + 1) / total_seconds * 100 if total_seconds else 100
-            print(f"Progress: {percent:.1f}% ({sec + 1}/{total_seconds} sec)")
-
-    out.release()
+    # Each frame is written once and shown for a whole second
+    with OverlayVideoWriter(output_path, fps, resolution, total_seconds) as out:
+        # Render frames
+        for sec in range(total_seconds):
+            # Calculate actual dive time for sample lookup
+            dive_time = sec + time_offset
+
+            # Move position indicator to current time; samples are usually further apart
+            # than a second, so the previous frame can often be written again as is
+            index = _current_sample_index(compiled, dive_time)
+            if index != last_index:
+                if indicator_region is not None:
+                    frame_bgr[indicator_region] = base_bgr[indicator_region]
+                indicator_region = _draw_indicator(compiled, index, frame_bgr, indicator_bgr)
+                last_index = index
+
+            out.write_second(frame_bgr)
+
+            # Progress reporting
+            if (sec + 1) % progress_step == 0 or sec == total_seconds - 1:
+                percent = (sec + 1) / total_seconds * 100 if total_seconds else 100
+                print(f"Progress: {percent:.1f}% ({sec + 1}/{total_seconds} sec)")
 
 
 def generate_test_profile_image(
@@ -1,5 +1,6 @@
 # Library used from https://github.com/OneMadGypsy/SimPIL-Font with small fixes for extra font paths
-# and styles
+# and styles, font files read once per path, dict-based style matching, scandir font discovery
+# and font names cached across runs, with one directory scan indexing every family
 
 # MIT License
 
@@ -24,10 +25,9 @@
 # SOFTWARE.
 
 from __future__ import annotations
-from glob import iglob
 from PIL import ImageFont
 
-import os, sys, json, functools, re
+import os, sys, io, json, functools, re
 
 __all__ = ('Font',)
 
@@ -51,6 +51,109 @@ STYLE_WORDS = {
 
 EXTENSIONS = (".ttf", ".otf", ".ttc", ".otc")
 
+_COMPOUND_STYLE = re.compile(
+    r'(thin|extralight|ultralight|light|book|regular|normal|medium|semibold|demibold|bold|extrabold|ultrabold|black|heavy)?'
+    r'(italic|oblique)?'
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _font_bytes(path: str) -> bytes:
+    """
+    Read a font file once; every size loaded from it shares the same buffer
+    (BytesIO over bytes does not copy, and FreeType reads the face from memory).
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# Font file -> [mtime_ns, size, encoding, family, style] probed in earlier runs, persisted as JSON
+_enc_cache: dict | None = None
+_enc_cache_dirty = False
+_enc_cache_on_disk = True
+
+
+def set_disk_cache(enabled: bool) -> None:
+    """
+    Turn reading and writing fonts.json on or off. When off, probed fonts are only
+    cached in memory for the current process.
+    """
+    global _enc_cache_on_disk
+    _enc_cache_on_disk = enabled
+
+
+def disk_cache_enabled() -> bool:
+    return _enc_cache_on_disk
+
+
+def _enc_cache_path() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'scubaoverlay', 'fonts.json')
+
+
+def _load_enc_cache() -> dict:
+    global _enc_cache
+    if _enc_cache is None:
+        if not _enc_cache_on_disk:
+            _enc_cache = {}
+            return _enc_cache
+        try:
+            with open(_enc_cache_path(), 'r', encoding='utf-8') as f:
+                _enc_cache = json.load(f)
+            if not isinstance(_enc_cache, dict):
+                _enc_cache = {}
+        except Exception:
+            _enc_cache = {}
+    return _enc_cache
+
+
+def _save_enc_cache() -> None:
+    """
+    Write probed font names back to disk if anything new was probed. A cache that cannot
+    be written only costs the next run its speed-up, so errors are ignored.
+    """
+    global _enc_cache_dirty
+    if not _enc_cache_dirty or not _enc_cache_on_disk:
+        return
+    _enc_cache_dirty = False
+    path = _enc_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_enc_cache, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+
+
+def _iter_font_files(directory: str):
+    """
+    Yield font file paths below directory: each directory's font files sorted by name,
+    then its subdirectories by name, depth-first, with hidden names skipped. Sorting
+    makes the face chosen for a style found in several files (the last one wins in the
+    index) independent of the filesystem's listing order. Uses one scandir per
+    directory and no per-file stat or pattern matching.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.name.startswith('.'):
+            continue
+        if entry.name.lower().endswith(EXTENSIONS):
+            yield entry.path
+        try:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+        except OSError:
+            pass
+    for subdir in subdirs:
+        yield from _iter_font_files(subdir)
+
 
 class Font:
     # https://pillow.readthedocs.io/en/stable/reference/ImageFont.html#PIL.ImageFont.truetype
@@ -107,14 +210,13 @@ class Font:
 
             pl = part.lower()
 
-            # match compound single tokens like "BoldItalic" or "SemiBoldItalic"
-            m = re.fullmatch(
-                r'(thin|extralight|ultralight|light|book|regular|normal|medium|semibold|demibold|bold|extrabold|ultrabold|black|heavy)?'
-                r'(italic|oblique)?', pl
-            )
             if pl in STYLE_WORDS:
                 style_tokens.append(pl)
-            elif m and (m.group(1) or m.group(2)):
+                continue
+
+            # match compound single tokens like "BoldItalic" or "SemiBoldItalic"
+            m = _COMPOUND_STYLE.fullmatch(pl)
+            if m and (m.group(1) or m.group(2)):
                 if m.group(1): style_tokens.append(m.group(1))
                 if m.group(2): style_tokens.append(m.group(2))
             else:
@@ -135,19 +237,8 @@ class Font:
         self._size   = size or self.size
 
         # choose style: requested if present, else 'regular'/'book', else first available
-        chosen_style = None
-        for s in self._styles:
-            if _style_key == s.replace(' ', '').lower():
-                chosen_style = s
-                break
-        if not chosen_style:
-            for fallback in ('regular', 'book'):
-                for s in self._styles:
-                    if fallback == s.replace(' ', '').lower():
-                        chosen_style = s
-                        break
-                if chosen_style:
-                    break
+        _style_map = font['style_map']
+        chosen_style = _style_map.get(_style_key) or _style_map.get('regular') or _style_map.get('book')
         if not chosen_style and self._styles:
             chosen_style = self._styles[0]
 
@@ -159,7 +250,7 @@ class Font:
         if not self._path:
             raise Exception(Font.DNE_EXCEPT)
 
-        self._font = ImageFont.truetype(self._path, self._size, encoding=font['encoding'])
+        self._font = ImageFont.truetype(io.BytesIO(_font_bytes(self._path)), self._size, encoding=font['encoding'])
 
         return self
 
@@ -167,8 +258,23 @@ class Font:
     def __enc(self, fn: str) -> tuple:
         """
         Determine an encoding Pillow accepts for this font file and return (encoding, family, style).
-        Cached to avoid re-opening the same file repeatedly.
+        Cached to avoid re-opening the same file repeatedly, and across runs by file mtime and size.
         """
+        global _enc_cache_dirty
+        try:
+            st = os.stat(fn)
+            stamp = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            stamp = None
+
+        cache = _load_enc_cache()
+        entry = cache.get(fn)
+        if stamp and isinstance(entry, list) and len(entry) == 5 and entry[:2] == stamp:
+            if entry[2] is None:
+                raise Exception(Font.ENC_EXCEPT.format(fn))
+            return tuple(entry[2:])
+
+        result = None
         for encoding in Font.ENCODINGS:
             try:
                 ttf = ImageFont.truetype(font=fn, encoding=encoding)
@@ -176,33 +282,33 @@ class Font:
                 continue
             else:
                 family, style = ttf.getname()
-                return encoding, family, style
-        raise Exception(Font.ENC_EXCEPT.format(fn))
+                result = encoding, family, style
+                break
+
+        if stamp:
+            cache[fn] = stamp + list(result or (None, None, None))
+            _enc_cache_dirty = True
+        if result is None:
+            raise Exception(Font.ENC_EXCEPT.format(fn))
+        return result
 
     @functools.cache
-    def __get(self, fam: str) -> dict:
+    def __index(self) -> dict:
         """
-        Build the face map for a family key like 'arial' (lower, no spaces).
-        Returns dict(family=<Display Name>, styles=[...], faces={style_key: path}, encoding=<enc>)
+        Scan the font directories once and build the face map of every family, keyed like
+        'arial' (lower, no spaces). Each value is
+        dict(family=<Display Name>, styles=[...], faces={style_key: path},
+             style_map={style_key: style}, encoding=<enc>)
         """
-        t_family: str = ''
-        t_styles: list[str] = []
-        t_faces: dict[str, str] = {}
-        chosen_encoding: str | None = None
+        index: dict[str, dict] = {}
 
-        # Scan all candidate font files and keep those where PIL reports the same family
+        # Scan all candidate font files and group them by the family PIL reports
         for directory in self._fontdirs:
             if not os.path.isdir(directory):
                 continue
 
             # We scan all font files to avoid case-sensitivity misses on Linux
-            pattern = os.path.join(directory, '**', '*')
-            for path in iglob(pattern, recursive=True):
-                if not isinstance(path, str):
-                    continue
-                if not path.lower().endswith(EXTENSIONS):
-                    continue
-
+            for path in _iter_font_files(directory):
                 fn = os.path.abspath(path)
                 try:
                     encoding, family, style = self.__enc(fn)
@@ -210,26 +316,38 @@ class Font:
                     continue
 
                 fam_key = family.lower().replace(' ', '')
-                if fam_key != fam:
-                    continue
+                font = index.get(fam_key)
+                if font is None:
+                    font = index[fam_key] = dict(family=family, styles=[], faces={}, style_map={}, encoding=encoding)
 
                 # Normalize keys for matching, keep original for display list
                 style_key = style.lower().replace(' ', '')
-                t_faces[style_key] = fn
-                if style not in t_styles:
-                    t_styles.append(style)
+                font['faces'][style_key] = fn
+                if style not in font['styles']:
+                    font['styles'].append(style)
+                    # normalized style key -> first style string with that key, for O(1) style matching
+                    font['style_map'].setdefault(style_key, style)
 
-                t_family = family
-                chosen_encoding = chosen_encoding or encoding
+                font['family'] = family
+                font['encoding'] = font['encoding'] or encoding
 
-        if not t_faces:
-            raise Exception(Font.DNE_EXCEPT)
+        _save_enc_cache()
+        return index
 
-        return dict(family=t_family, styles=t_styles, faces=t_faces, encoding=chosen_encoding or 'unic')
+    def __get(self, fam: str) -> dict:
+        """
+        Return the face map for a family key like 'arial' (lower, no spaces).
+        Returns dict(family=<Display Name>, styles=[...], faces={style_key: path},
+                     style_map={style_key: style}, encoding=<enc>)
+        """
+        font = self.__index().get(fam)
+        if font is None:
+            raise Exception(Font.DNE_EXCEPT)
+        return font
 
-    def export(self) -> None:
+    def listing(self) -> dict:
         """
-        Export a JSON listing of all discoverable fonts grouped by encoding,
+        Return all discoverable fonts grouped by encoding,
         e.g., {"unic": ["Arial regular", "Arial bold", ...], ...}
         """
         out = {k: [] for k in Font.ENCODINGS}
@@ -237,9 +355,7 @@ class Font:
         for directory in self._fontdirs:
             if not os.path.isdir(directory):
                 continue
-            for path in iglob(os.path.join(directory, '**', '*'), recursive=True):
-                if not isinstance(path, str) or not path.lower().endswith(EXTENSIONS):
-                    continue
+            for path in _iter_font_files(directory):
                 fn = os.path.abspath(path)
                 try:
                     encoding, family, style = self.__enc(fn)
@@ -247,8 +363,15 @@ class Font:
                     continue
                 out.setdefault(encoding, []).append(f'{family} {style.lower()}')
 
+        _save_enc_cache()
+        return out
+
+    def export(self) -> None:
+        """
+        Export a JSON listing of all discoverable fonts grouped by encoding to './fonts.json'.
+        """
         with open('fonts.json', 'w', encoding='utf-8') as f:
-            f.write(json.dumps(out, indent=4, ensure_ascii=False))
+            json.dump(self.listing(), f, indent=4, ensure_ascii=False)
 
         return self
 
@@ -1,5 +1,11 @@
 import yaml
 
+# Prefer the libyaml-based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 
 class TemplateError(Exception):
     """Base exception for template loading errors."""
@@ -21,7 +27,7 @@ class TemplateParseError(TemplateError):
 def load_template(template_file):
     try:
         with open(template_file, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_SafeLoader)
     except FileNotFoundError:
         raise TemplateNotFoundError(template_file)
     except yaml.YAMLError as e:
@@ -19,6 +19,14 @@ try:
 except ImportError:
     PYMEDIAINFO_AVAILABLE = False
 
+# Non-ISO timestamp formats seen in MediaInfo date tags
+_SPACE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_SLASH_TIME_FORMAT = '%Y/%m/%d %H:%M:%S'
+
+# Platform-specific birth time handling: macOS has st_birthtime, Windows and Linux
+# use st_ctime
+_CREATION_TIME_ATTR = "st_birthtime" if platform.system() == "Darwin" else "st_ctime"
+
 
 @dataclass
 class VideoMetadata:
@@ -59,15 +67,22 @@ def detect_timezone_offset(
         dive_end: Dive end time (UTC)
 
     Returns:
-        Hour offset if found, None if no offset within ±10 hours works
+        Hour offset if found, None if no offset within ±10 hours works.
+        The smallest working offset is returned, in generate_timezone_offsets() order.
     """
-    for offset_hours in generate_timezone_offsets():
-        adjusted_time = video_time + timedelta(hours=offset_hours)
-
-        if dive_start <= adjusted_time <= dive_end:
-            return offset_hours
+    # Whole-hour offsets that place video_time in [dive_start, dive_end] form the
+    # range ceil((dive_start - video_time) / 1h) .. floor((dive_end - video_time) / 1h)
+    hour = timedelta(hours=1)
+    lowest = max(-((video_time - dive_start) // hour), -10)
+    highest = min((dive_end - video_time) // hour, 10)
 
-    return None
+    if lowest > highest:
+        return None
+    if lowest > 0:
+        return lowest
+    if highest < 0:
+        return highest
+    return 0
 
 
 def get_video_duration(video_path: str) -> float:
@@ -155,21 +170,14 @@ def get_video_creation_time_from_metadata(video_path: str) -> Optional[datetime]
                         dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
                         return dt.astimezone(timezone.utc)
 
-                    # Try space-separated format
+                    # Try space-separated formats, picking by date separator
+                    fmt = _SLASH_TIME_FORMAT if '/' in time_str[:10] else _SPACE_TIME_FORMAT
                     try:
-                        dt = datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
+                        dt = datetime.strptime(time_str, fmt)
                         return dt.replace(tzinfo=timezone.utc)
                     except ValueError:
                         pass
 
-                    # Try other common formats
-                    for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y/%m/%d %H:%M:%S']:
-                        try:
-                            dt = datetime.strptime(time_str, fmt)
-                            return dt.replace(tzinfo=timezone.utc)
-                        except ValueError:
-                            continue
-
                 except (ValueError, AttributeError):
                     continue
 
@@ -189,14 +197,7 @@ def get_file_creation_time(file_path: str) -> datetime:
     Returns:
         File creation time as datetime in UTC
     """
-    stat_info = os.stat(file_path)
-
-    # Platform-specific birth time handling
-    system = platform.system()
-    if system == "Darwin":  # macOS
-        timestamp = stat_info.st_birthtime
-    else:  # Windows, Linux
-        timestamp = stat_info.st_ctime
+    timestamp = getattr(os.stat(file_path), _CREATION_TIME_ATTR)
 
     # Convert to UTC datetime
     dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
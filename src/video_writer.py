@@ -0,0 +1,162 @@
+"""Video writer for overlay renderers that produce one frame per second of output.
+
+Overlay frames only change once per second, so instead of pushing every duplicate
+frame through the encoder, each rendered frame is piped to ffmpeg once at an input
+rate of 1 fps and ffmpeg repeats it up to the requested output frame rate. libx264
+then encodes the repeats as (nearly empty) P-frames.
+
+ffmpeg is optional: when it is not on PATH, was built without libx264, or the frame
+size cannot be encoded as yuv420p, the writer falls back to OpenCV's VideoWriter
+with the mp4v codec and writes each frame fps times.
+
+ffmpeg releases differ in how long they show the last 1 fps input frame, so the
+last frame is padded with one extra second and the output is cut to exactly
+total_seconds * fps frames, the same count the OpenCV path writes.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def _ffmpeg_path() -> Optional[str]:
+    return shutil.which("ffmpeg")
+
+
+@functools.lru_cache(maxsize=None)
+def _has_libx264(ffmpeg: str) -> bool:
+    """Check once per ffmpeg binary that it was built with the libx264 encoder."""
+    try:
+        result = subprocess.run([ffmpeg, "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0 and any(
+        line.split()[1:2] == ["libx264"] for line in result.stdout.splitlines()
+    )
+
+
+class OverlayVideoWriter:
+    """Write BGR frames to a video file, one frame per second of output.
+
+    Use as a context manager: on a clean exit the file is finalised with release(),
+    and if the body raises, abort() stops the encoder and removes the partial file.
+
+    Args:
+        output_path: Destination video file
+        fps: Output frame rate
+        resolution: Frame size as (width, height)
+        total_seconds: Number of seconds (frames) that will be written
+    """
+
+    def __init__(self, output_path: str, fps: int, resolution: Tuple[int, int], total_seconds: int):
+        self.output_path = output_path
+        self.fps = fps
+        self.resolution = resolution
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr = None
+        self._cv_writer = None
+
+        width, height = resolution
+        ffmpeg = _ffmpeg_path()
+        # yuv420p needs even dimensions
+        if ffmpeg and width % 2 == 0 and height % 2 == 0 and _has_libx264(ffmpeg):
+            cmd = [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "bgr24",
+                "-s", f"{width}x{height}", "-framerate", "1",
+                "-i", "-",
+                "-vf", f"tpad=stop=1:stop_mode=clone,fps={fps}",
+                "-frames:v", str(total_seconds * fps),
+                "-c:v", "libx264", "-preset", "veryfast",
+                "-pix_fmt", "yuv420p",
+                output_path,
+            ]
+            # ffmpeg's log goes to a temporary file rather than a pipe, so a chatty
+            # ffmpeg can never block on a full stderr pipe that nobody reads
+            self._stderr = tempfile.TemporaryFile()
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=self._stderr)
+            self.backend = "ffmpeg"
+        else:
+            fourcc_func = getattr(cv2, "VideoWriter_fourcc", None)
+            fourcc = fourcc_func(*'mp4v') if fourcc_func else 0
+            self._cv_writer = cv2.VideoWriter(output_path, fourcc, fps, resolution)
+            self.backend = "opencv"
+
+    def __enter__(self) -> "OverlayVideoWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.release()
+        else:
+            self.abort()
+
+    def write_second(self, frame_bgr: np.ndarray) -> None:
+        """Write one second of video showing the given frame."""
+        if self._proc is not None:
+            try:
+                self._proc.stdin.write(np.ascontiguousarray(frame_bgr).data)
+            except BrokenPipeError:
+                self._raise_ffmpeg_error()
+        else:
+            # cv2 copies non-contiguous arrays on every write, so convert once per second
+            frame_bgr = np.ascontiguousarray(frame_bgr)
+            for _ in range(self.fps):
+                self._cv_writer.write(frame_bgr)
+
+    def release(self) -> None:
+        """Flush and close the output file."""
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            self._proc.wait()
+            if self._proc.returncode != 0:
+                self._raise_ffmpeg_error()
+            self._close_ffmpeg()
+        elif self._cv_writer is not None:
+            self._cv_writer.release()
+            self._cv_writer = None
+
+    def abort(self) -> None:
+        """Stop writing after an error and remove the incomplete output file."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._close_ffmpeg()
+        elif self._cv_writer is not None:
+            self._cv_writer.release()
+            self._cv_writer = None
+        self._remove_output()
+
+    def _remove_output(self) -> None:
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
+
+    def _close_ffmpeg(self) -> None:
+        for stream in (self._proc.stdin, self._stderr):
+            try:
+                stream.close()
+            except (BrokenPipeError, OSError):
+                pass
+        self._proc = None
+        self._stderr = None
+
+    def _raise_ffmpeg_error(self):
+        self._proc.wait()
+        self._stderr.seek(0)
+        stderr = self._stderr.read().decode(errors="replace").strip()
+        self._close_ffmpeg()
+        # Whatever ffmpeg wrote is truncated or corrupt
+        self._remove_output()
+        raise RuntimeError(f"ffmpeg failed writing {self.output_path}: {stderr}")